@@ -1,5 +1,7 @@
-# 채널 정보 데이터
-CHANNELS = [
+from types import MappingProxyType
+
+# 채널 정보 원본 데이터
+_CHANNEL_DATA = [
     {
         "name": "Minato Aqua",
         "id": "UC1opHUrw8rvnsadT-iGp7Cg",
@@ -112,5 +114,14 @@ CHANNELS = [
     }
 ]
 
+# 실수로 테마 색상 등을 바꾸지 않도록 읽기 전용 뷰의 튜플로 고정한다.
+CHANNELS = tuple(
+    MappingProxyType({**ch, "theme": MappingProxyType(dict(ch["theme"]))})
+    for ch in _CHANNEL_DATA
+)
+
 # 채널 ID 목록만 추출
-CHANNEL_IDS = [ch["id"] for ch in CHANNELS]
+CHANNEL_IDS = tuple(ch["id"] for ch in CHANNELS)
+
+# 채널 ID로 바로 찾는 조회표 (CHANNELS 선형 탐색 대체)
+CHANNEL_BY_ID = MappingProxyType({ch["id"]: ch for ch in CHANNELS})
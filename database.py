@@ -2,8 +2,10 @@
 HoloProject Database Module
 SQLite를 사용한 비디오 데이터베이스 관리
 """
+import atexit
 import sqlite3
 import json
+import logging
 import os
 import shutil
 import gzip
@@ -15,11 +17,66 @@ from functools import lru_cache
 from typing import Optional
 from contextlib import contextmanager
 
+logger = logging.getLogger(__name__)
+
+# --- 성능 최적화: orjson 사용 (json_data 직렬화/파싱) ---
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 DEFAULT_DB_PATH = os.path.join(os.path.dirname(__file__), 'videos.db')
 DEFAULT_DB_GZIP_PATH = f"{DEFAULT_DB_PATH}.gz"
 SEED_DB_URL = os.environ.get("SEED_DB_URL", "").strip()
 SEED_DB_MIN_VIDEO_COUNT = int(os.environ.get("SEED_DB_MIN_VIDEO_COUNT", "50000"))
 SEED_DB_ASYNC = os.environ.get("SEED_DB_ASYNC", "").lower() not in {"0", "false", "no"}
+VIDEO_INSERT_COLUMNS_SQL = """
+    (id, title, channel_id, channel_name, published_at, available_at, duration, status, type, topic_id, is_membership, json_data)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+VIDEO_UPSERT_SQL = f"""
+    INSERT INTO videos {VIDEO_INSERT_COLUMNS_SQL}
+    ON CONFLICT(id) DO UPDATE SET
+        title = excluded.title,
+        channel_id = excluded.channel_id,
+        channel_name = excluded.channel_name,
+        published_at = excluded.published_at,
+        available_at = excluded.available_at,
+        duration = excluded.duration,
+        status = excluded.status,
+        type = excluded.type,
+        topic_id = excluded.topic_id,
+        is_membership = excluded.is_membership,
+        json_data = excluded.json_data
+"""
+# 연결마다 적용하는 PRAGMA (journal_mode=WAL은 파일 헤더에 남으므로 DB별 1회만 설정)
+SQLITE_BUSY_TIMEOUT_MS = 5000
+# 검색 SQL은 필터 모양별로 고정 문자열이 되므로 연결별 문장 캐시를 넉넉히 둔다.
+SQLITE_STATEMENT_CACHE_SIZE = 256
+# busy_timeout 이후에도 잠금이 풀리지 않으면 쓰기 트랜잭션을 짧게 물러났다가 다시 시도한다.
+SQLITE_WRITE_RETRY_ATTEMPTS = 3
+SQLITE_WRITE_RETRY_BASE_DELAY = 0.1
+SQLITE_CONNECTION_PRAGMAS = (
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+SQLITE_SIDECAR_SUFFIXES = ("-wal", "-shm")
+_wal_initialized_paths = set()
+_wal_lock = threading.Lock()
+# 요청마다 연결을 새로 열지 않고 스레드별 연결을 재사용해 페이지 캐시를 유지한다.
+_local = threading.local()
+_open_connections = set()
+_connections_lock = threading.Lock()
+_connection_generation = 0
+# 구버전 SQLite의 바인딩 변수 상한(999)보다 작게 IN 목록을 나눈다.
+SQLITE_IN_CHUNK_SIZE = 500
+# trigram 토크나이저는 3자 미만 검색어를 색인으로 찾을 수 없다.
+TITLE_FTS_MIN_QUERY_LENGTH = 3
+title_fts_enabled = False
 seed_restore_status = {
     "state": "idle",
     "error": None,
@@ -122,6 +179,8 @@ def start_seed_restore_thread(url: str, target: str) -> None:
     def worker() -> None:
         try:
             restore_seed_from_url(url, target)
+            # 이전 버전에서 만든 seed에는 새 테이블/인덱스가 없을 수 있다.
+            init_db()
             seed_restore_status.update({"state": "ready", "completedAt": time.time()})
         except Exception as exc:
             seed_restore_status.update({
@@ -167,6 +226,9 @@ def move_unseeded_db_aside(target: str) -> None:
 
     backup_path = f"{target}.preseed-{int(time.time())}.bak"
     shutil.move(target, backup_path)
+    for suffix in SQLITE_SIDECAR_SUFFIXES:
+        if os.path.exists(f"{target}{suffix}"):
+            shutil.move(f"{target}{suffix}", f"{backup_path}{suffix}")
     print(f"Existing unseeded database moved aside: {backup_path}")
 
 
@@ -199,7 +261,10 @@ def restore_seed_from_url(url: str, target: str) -> None:
         else:
             shutil.copy2(temp_download_path, temp_db_path)
 
+        # 이전 DB의 WAL/SHM이 새 seed 파일에 재생되지 않도록 먼저 지운다.
+        remove_sqlite_sidecars(target)
         os.replace(temp_db_path, target)
+        reset_connections()
         seed_restore_status.update({"state": "ready", "completedAt": time.time()})
         print(f"External database seed restored to persistent path: {target}")
     finally:
@@ -208,6 +273,15 @@ def restore_seed_from_url(url: str, target: str) -> None:
                 os.remove(path)
 
 
+def remove_sqlite_sidecars(path: str) -> None:
+    """DB 파일 교체 전에 남아 있는 WAL/SHM 파일을 정리한다."""
+    for suffix in SQLITE_SIDECAR_SUFFIXES:
+        sidecar = f"{path}{suffix}"
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+    _wal_initialized_paths.discard(os.path.abspath(path))
+
+
 def get_seed_status() -> dict:
     """운영 DB seed 복원 상태를 민감 정보 없이 반환한다."""
     exists = os.path.exists(DB_PATH)
@@ -229,15 +303,89 @@ def get_seed_status() -> dict:
 seed_persistent_db_if_needed()
 
 
+def open_connection() -> sqlite3.Connection:
+    """PRAGMA를 적용한 새 SQLite 연결을 연다."""
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=SQLITE_STATEMENT_CACHE_SIZE,
+    )
+    conn.row_factory = sqlite3.Row
+    try:
+        apply_connection_pragmas(conn)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    with _connections_lock:
+        _open_connections.add(conn)
+    return conn
+
+
+def discard_connection(conn: sqlite3.Connection) -> None:
+    with _connections_lock:
+        _open_connections.discard(conn)
+    conn.close()
+
+
+def close_thread_connection() -> None:
+    """현재 스레드가 보관한 연결을 닫는다."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.conn = None
+        discard_connection(conn)
+
+
+@atexit.register
+def close_all_connections() -> None:
+    with _connections_lock:
+        connections = list(_open_connections)
+        _open_connections.clear()
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+def reset_connections() -> None:
+    """DB 파일이 교체되면 각 스레드가 다음 사용 시 새 연결을 열게 한다."""
+    global _connection_generation
+    _connection_generation += 1
+
+
 @contextmanager
 def get_connection():
-    """데이터베이스 연결 컨텍스트 매니저"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """스레드별로 재사용하는 데이터베이스 연결 컨텍스트 매니저"""
+    key = (os.path.abspath(DB_PATH), _connection_generation)
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.key != key:
+        close_thread_connection()
+        conn = open_connection()
+        _local.conn, _local.key, _local.depth = conn, key, 0
+
+    _local.depth += 1
     try:
         yield conn
     finally:
-        conn.close()
+        _local.depth -= 1
+        # 연결을 닫지 않으므로 커밋되지 않은 트랜잭션이 다음 호출로 새지 않게 정리한다.
+        if _local.depth == 0 and conn.in_transaction:
+            conn.rollback()
+
+
+def apply_connection_pragmas(conn) -> None:
+    """WAL 모드와 연결 단위 성능 PRAGMA를 적용한다."""
+    db_path = os.path.abspath(DB_PATH)
+    if db_path not in _wal_initialized_paths:
+        with _wal_lock:
+            if db_path not in _wal_initialized_paths:
+                # WAL은 읽기가 쓰기를 기다리지 않게 하고, NORMAL 동기화와 함께 커밋당 fsync를 줄인다.
+                conn.execute("PRAGMA journal_mode=WAL")
+                _wal_initialized_paths.add(db_path)
+
+    for pragma in SQLITE_CONNECTION_PRAGMAS:
+        conn.execute(pragma)
 
 
 def init_db():
@@ -258,9 +406,11 @@ def init_db():
                 status TEXT,
                 type TEXT,
                 topic_id TEXT,
-                json_data TEXT
+                json_data TEXT,
+                is_membership INTEGER NOT NULL DEFAULT 0
             )
         ''')
+        ensure_membership_column(cursor)
 
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS video_songs (
@@ -291,8 +441,10 @@ def init_db():
                 raw_json TEXT,
                 PRIMARY KEY(video_id, mention_id),
                 FOREIGN KEY(video_id) REFERENCES videos(id)
-            )
+            ) WITHOUT ROWID
         ''')
+        migrate_video_mentions_without_rowid(cursor)
+        ensure_excluded_topics(cursor)
         
         # 인덱스 생성
         indexes = [
@@ -300,45 +452,311 @@ def init_db():
             'CREATE INDEX IF NOT EXISTS idx_available_at ON videos(available_at DESC)',
             'CREATE INDEX IF NOT EXISTS idx_title ON videos(title)',
             'CREATE INDEX IF NOT EXISTS idx_channel_available ON videos(channel_id, available_at DESC)',
+            'CREATE INDEX IF NOT EXISTS idx_channel_topic_date ON videos(channel_id, topic_id, available_at DESC)',
+            'CREATE INDEX IF NOT EXISTS idx_topic_date ON videos(topic_id, available_at DESC)',
+            # hide_unarchived 검색(status != 'missing')은 숨긴 영상을 건너뛰는 부분 인덱스를 탄다.
+            "CREATE INDEX IF NOT EXISTS idx_visible ON videos(channel_id, available_at DESC) WHERE status != 'missing'",
             'CREATE INDEX IF NOT EXISTS idx_video_songs_channel ON video_songs(channel_id, available_at DESC)',
             'CREATE INDEX IF NOT EXISTS idx_video_songs_title ON video_songs(song_title)',
             'CREATE INDEX IF NOT EXISTS idx_video_songs_video ON video_songs(video_id)',
-            'CREATE INDEX IF NOT EXISTS idx_video_mentions_member ON video_mentions(mention_id, video_id)',
-            'CREATE INDEX IF NOT EXISTS idx_video_mentions_video ON video_mentions(video_id)'
+            'CREATE INDEX IF NOT EXISTS idx_video_mentions_member ON video_mentions(mention_id, video_id)'
         ]
         for sql in indexes:
             cursor.execute(sql)
+        # 멤버십 통계는 channel_month_stats에서 읽으므로 이 인덱스는 upsert 비용만 늘린다.
+        cursor.execute('DROP INDEX IF EXISTS idx_channel_membership_date')
 
         backfill_video_mentions(cursor)
+        ensure_title_search_index(cursor)
+        ensure_channel_month_stats(cursor)
         
         conn.commit()
-        print(f'✅ Database initialized: {DB_PATH}')
+        refresh_query_planner_stats(cursor)
+        logger.info("Database initialized: %s", DB_PATH)
+
+
+def ensure_excluded_topics(cursor) -> None:
+    """topic 통계에서 뺄 topic 목록 테이블을 만들고, 처음 만들 때만 기본값을 넣는다.
+
+    이후에는 DB에서 직접 추가/삭제한 목록을 그대로 유지한다.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'excluded_topics'")
+    if cursor.fetchone():
+        return
+    cursor.execute("CREATE TABLE excluded_topics (topic_id TEXT PRIMARY KEY) WITHOUT ROWID")
+    cursor.executemany(
+        "INSERT OR IGNORE INTO excluded_topics (topic_id) VALUES (?)",
+        [(topic_id,) for topic_id in DEFAULT_EXCLUDED_TOPIC_IDS]
+    )
+
+
+def migrate_video_mentions_without_rowid(cursor) -> None:
+    """예전 rowid 기반 video_mentions를 (video_id, mention_id) 클러스터 테이블로 옮긴다.
+
+    행이 작고 항상 PK 접두어로 조회하므로 WITHOUT ROWID가 맞다.
+    PK 자동 인덱스와 video_id 단독 인덱스가 테이블과 중복 저장되던 공간도 사라진다.
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'video_mentions'")
+    row = cursor.fetchone()
+    if not row or "WITHOUT ROWID" in row["sql"].upper():
+        return
+
+    # 이전 시도가 중간에 끊겼다면 빈 임시 테이블이 남아 있을 수 있다.
+    cursor.execute("DROP TABLE IF EXISTS video_mentions_new")
+    cursor.execute("""
+        CREATE TABLE video_mentions_new (
+            video_id TEXT NOT NULL,
+            mention_id TEXT NOT NULL,
+            mention_name TEXT,
+            mention_english_name TEXT,
+            mention_photo TEXT,
+            raw_json TEXT,
+            PRIMARY KEY(video_id, mention_id),
+            FOREIGN KEY(video_id) REFERENCES videos(id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        INSERT OR REPLACE INTO video_mentions_new
+            (video_id, mention_id, mention_name, mention_english_name, mention_photo, raw_json)
+        SELECT video_id, mention_id, mention_name, mention_english_name, mention_photo, raw_json
+        FROM video_mentions
+    """)
+    cursor.execute("DROP TABLE video_mentions")
+    cursor.execute("ALTER TABLE video_mentions_new RENAME TO video_mentions")
+
+
+def refresh_query_planner_stats(cursor) -> None:
+    """쿼리 플래너가 복합 인덱스를 고를 수 있도록 통계를 갱신한다."""
+    cursor.execute("SELECT COUNT(*) AS count FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+    if cursor.fetchone()["count"] == 0:
+        cursor.execute("ANALYZE")
+    else:
+        # 통계가 이미 있으면 변경이 큰 테이블만 다시 분석한다.
+        cursor.execute("PRAGMA optimize")
+
+
+def ensure_title_search_index(cursor) -> None:
+    """제목 부분 검색용 FTS5 trigram 인덱스와 동기화 트리거를 만든다."""
+    global title_fts_enabled
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts
+            USING fts5(id UNINDEXED, title, tokenize='trigram')
+        """)
+    except sqlite3.OperationalError as exc:
+        # FTS5/trigram이 없는 SQLite 빌드는 기존 LIKE 검색으로 동작한다.
+        print(f"Title FTS index unavailable, falling back to LIKE: {exc}")
+        title_fts_enabled = False
+        return
+
+    # seed DB를 VACUUM INTO로 만들면 videos rowid가 바뀔 수 있어, 영상 id -> FTS rowid 매핑을 따로 둔다.
+    # FTS5의 UNINDEXED id로 지우면 행마다 전체 스캔이 되므로 삭제/제목 변경은 FTS rowid로 처리한다.
+    cursor.execute("SELECT COUNT(*) AS count FROM sqlite_master WHERE type = 'table' AND name = 'videos_fts_map'")
+    has_fts_map = cursor.fetchone()["count"] > 0
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS videos_fts_map (
+            id TEXT PRIMARY KEY,
+            fts_rowid INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    if not has_fts_map:
+        # 매핑이 없던 이전 인덱스는 rowid를 알 수 없으므로 비우고 아래에서 다시 채운다.
+        cursor.execute("DELETE FROM videos_fts")
+    triggers = [
+        """
+            CREATE TRIGGER videos_fts_ai AFTER INSERT ON videos
+            WHEN new.id IS NOT NULL BEGIN
+                INSERT INTO videos_fts (id, title) VALUES (new.id, new.title);
+                INSERT INTO videos_fts_map (id, fts_rowid) VALUES (new.id, last_insert_rowid());
+            END
+        """,
+        """
+            CREATE TRIGGER videos_fts_ad AFTER DELETE ON videos BEGIN
+                DELETE FROM videos_fts WHERE rowid = (SELECT fts_rowid FROM videos_fts_map WHERE id = old.id);
+                DELETE FROM videos_fts_map WHERE id = old.id;
+            END
+        """,
+        """
+            CREATE TRIGGER videos_fts_au AFTER UPDATE OF title ON videos
+            WHEN new.id IS NOT NULL AND old.title IS NOT new.title BEGIN
+                DELETE FROM videos_fts WHERE rowid = (SELECT fts_rowid FROM videos_fts_map WHERE id = old.id);
+                INSERT INTO videos_fts (id, title) VALUES (new.id, new.title);
+                UPDATE videos_fts_map SET fts_rowid = last_insert_rowid() WHERE id = new.id;
+            END
+        """
+    ]
+    # 이전 버전의 id 스캔 트리거가 남지 않도록 매번 다시 만든다.
+    for name in ("videos_fts_ai", "videos_fts_ad", "videos_fts_au"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for sql in triggers:
+        cursor.execute(sql)
+
+    cursor.execute("SELECT EXISTS(SELECT 1 FROM videos_fts) AS indexed")
+    if not cursor.fetchone()["indexed"]:
+        cursor.execute("DELETE FROM videos_fts_map")
+        cursor.execute("INSERT INTO videos_fts (id, title) SELECT id, title FROM videos WHERE id IS NOT NULL")
+        cursor.execute("INSERT INTO videos_fts_map (id, fts_rowid) SELECT id, rowid FROM videos_fts")
+    title_fts_enabled = True
+
+
+# membersonly, shorts, announce 등 컨텐츠가 아닌 태그 (excluded_topics 초기값)
+DEFAULT_EXCLUDED_TOPIC_IDS = ('membersonly', 'shorts', 'announce', 'Original_Song', 'Music_Cover', 'watchalong', 'morning')
+MEMBERSHIP_TITLE_KEYWORDS = ('メン限', 'Members', 'メンバー限定', '멤버십', 'Membersonly')
+
+
+def membership_condition_sql(row: str) -> str:
+    """topic_id 'membersonly' 또는 제목 키워드로 멤버십 방송을 판별하는 SQL 식 (is_membership 백필용)"""
+    keywords = " OR ".join(f"{row}.title LIKE '%{keyword}%'" for keyword in MEMBERSHIP_TITLE_KEYWORDS)
+    return f"(json_extract({row}.json_data, '$.topic_id') = 'membersonly' OR {keywords})"
+
+
+def is_membership_video(video: dict) -> bool:
+    """membership_condition_sql과 같은 규칙을 삽입 시점에 한 번만 평가한다."""
+    if video.get('topic_id') == 'membersonly':
+        return True
+    title = (video.get('title') or '').lower()
+    return any(keyword.lower() in title for keyword in MEMBERSHIP_TITLE_KEYWORDS)
+
+
+def ensure_membership_column(cursor) -> None:
+    """예전 DB에 is_membership 컬럼을 추가하고 기존 행을 한 번 채운다."""
+    cursor.execute("PRAGMA table_info(videos)")
+    if any(row["name"] == "is_membership" for row in cursor.fetchall()):
+        return
+    cursor.execute("ALTER TABLE videos ADD COLUMN is_membership INTEGER NOT NULL DEFAULT 0")
+    cursor.execute(f"UPDATE videos SET is_membership = 1 WHERE {membership_condition_sql('videos')}")
+
+
+def month_stats_key_sql(row: str) -> str:
+    """available_at(ISO 문자열)에서 (channel_id, year, month) 키를 만드는 SQL 식"""
+    return (
+        f"{row}.channel_id, "
+        f"COALESCE(CAST(substr({row}.available_at, 1, 4) AS INTEGER), 0), "
+        f"COALESCE(CAST(substr({row}.available_at, 6, 2) AS INTEGER), 0)"
+    )
+
+
+def ensure_channel_month_stats(cursor) -> None:
+    """채널별 년/월 방송 수 요약 테이블과 동기화 트리거를 만든다."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS channel_month_stats (
+            channel_id TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            membership INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (channel_id, year, month)
+        ) WITHOUT ROWID
+    """)
+
+    def add_sql(row: str) -> str:
+        return f"""
+            INSERT INTO channel_month_stats (channel_id, year, month, total, membership)
+            VALUES ({month_stats_key_sql(row)}, 1, {row}.is_membership)
+            ON CONFLICT(channel_id, year, month) DO UPDATE SET
+                total = total + 1,
+                membership = membership + excluded.membership;
+        """
+
+    def remove_sql(row: str) -> str:
+        key_match = f"(channel_id, year, month) = ({month_stats_key_sql(row)})"
+        return f"""
+            UPDATE channel_month_stats SET
+                total = total - 1,
+                membership = membership - {row}.is_membership
+            WHERE {key_match};
+            DELETE FROM channel_month_stats WHERE {key_match} AND total <= 0;
+        """
+
+    triggers = [
+        f"""
+            CREATE TRIGGER channel_month_stats_ai AFTER INSERT ON videos
+            WHEN new.channel_id IS NOT NULL BEGIN
+                {add_sql("new")}
+            END
+        """,
+        f"""
+            CREATE TRIGGER channel_month_stats_ad AFTER DELETE ON videos
+            WHEN old.channel_id IS NOT NULL BEGIN
+                {remove_sql("old")}
+            END
+        """,
+        # 동기화 upsert는 매번 UPDATE를 일으키므로 키나 멤버십 여부가 바뀐 경우에만 옮긴다.
+        f"""
+            CREATE TRIGGER channel_month_stats_au AFTER UPDATE ON videos
+            WHEN old.channel_id IS NOT new.channel_id
+              OR substr(old.available_at, 1, 7) IS NOT substr(new.available_at, 1, 7)
+              OR old.is_membership IS NOT new.is_membership
+            BEGIN
+                {remove_sql("old")}
+                {add_sql("new")}
+            END
+        """,
+    ]
+    # 트리거 정의가 바뀌어도 기존 DB에 반영되도록 매번 다시 만든다.
+    for name in ("channel_month_stats_ai", "channel_month_stats_ad", "channel_month_stats_au"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for sql in triggers:
+        cursor.execute(sql)
+
+    cursor.execute("SELECT EXISTS(SELECT 1 FROM channel_month_stats) AS filled")
+    if not cursor.fetchone()["filled"]:
+        cursor.execute(f"""
+            INSERT INTO channel_month_stats (channel_id, year, month, total, membership)
+            SELECT {month_stats_key_sql("videos")}, COUNT(*), SUM(is_membership)
+            FROM videos
+            WHERE videos.channel_id IS NOT NULL
+            GROUP BY 1, 2, 3
+        """)
+
+
+def dumps_json(value) -> str:
+    """DB 저장용 JSON 문자열을 만든다. (orjson이 있으면 사용, 비ASCII는 그대로 유지)"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            # 64비트를 넘는 정수 등 orjson이 거부하는 값은 표준 json으로 처리한다.
+            pass
+    return json.dumps(value, ensure_ascii=False)
+
+
+def loads_json(text):
+    """JSON 문자열/바이트(DB 컬럼, HTTP 본문)를 파싱한다. 실패 시 json.JSONDecodeError 계열 예외"""
+    if HAS_ORJSON:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def build_video_row(video: dict) -> tuple:
+    """videos 테이블 컬럼 순서에 맞춘 파라미터 튜플을 만든다."""
+    channel = video.get('channel') or {}
+    return (
+        video.get('id'),
+        video.get('title'),
+        channel.get('id'),
+        channel.get('name', ''),
+        video.get('published_at'),
+        video.get('available_at'),
+        video.get('duration'),
+        video.get('status'),
+        video.get('type'),
+        video.get('topic_id'),
+        int(is_membership_video(video)),
+        dumps_json(video)
+    )
 
 
 def insert_video(video: dict) -> bool:
     """단일 비디오 삽입 (중복 무시)"""
     with get_connection() as conn:
         cursor = conn.cursor()
-        channel = video.get('channel') or {}
-        
-        cursor.execute('''
-            INSERT OR IGNORE INTO videos 
-            (id, title, channel_id, channel_name, published_at, available_at, duration, status, type, topic_id, json_data)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            video.get('id'),
-            video.get('title'),
-            channel.get('id'),
-            channel.get('name', ''),
-            video.get('published_at'),
-            video.get('available_at'),
-            video.get('duration'),
-            video.get('status'),
-            video.get('type'),
-            video.get('topic_id'),
-            json.dumps(video, ensure_ascii=False)
-        ))
-        inserted = cursor.rowcount > 0
+        # 이미 있는 영상은 무시되므로 PK 조회로 먼저 걸러 json 직렬화를 건너뛴다.
+        cursor.execute("SELECT 1 FROM videos WHERE id = ?", (video.get('id'),))
+        inserted = False
+        if cursor.fetchone() is None:
+            cursor.execute(f"INSERT OR IGNORE INTO videos {VIDEO_INSERT_COLUMNS_SQL}", build_video_row(video))
+            inserted = cursor.rowcount > 0
         replace_video_mentions(cursor, video)
         conn.commit()
         clear_channel_index_cache()
@@ -368,7 +786,7 @@ def replace_video_mentions(cursor, video: dict) -> None:
             mention.get('name') or '',
             mention.get('english_name') or '',
             mention.get('photo') or '',
-            json.dumps(mention, ensure_ascii=False)
+            dumps_json(mention)
         ))
 
     if not rows:
@@ -388,11 +806,13 @@ def backfill_video_mentions(cursor) -> None:
     if existing_count:
         return
 
-    cursor.execute("SELECT id, json_data FROM videos")
-    rows = cursor.fetchall()
+    # 전체 json_data를 한꺼번에 올리지 않도록 읽기 전용 커서를 한 행씩 순회한다.
+    # (같은 커서로 쓰기를 하면 SELECT가 끊기므로 별도 커서를 쓴다.)
+    rows = cursor.connection.cursor()
+    rows.execute("SELECT id, json_data FROM videos")
     for row in rows:
         try:
-            video = json.loads(row["json_data"])
+            video = loads_json(row["json_data"])
         except (json.JSONDecodeError, TypeError):
             continue
         replace_video_mentions(cursor, video)
@@ -447,7 +867,7 @@ def replace_video_songs(cursor, video: dict) -> None:
             coerce_song_seconds(song.get('end')),
             song.get('art') or '',
             str(song.get('itunesid') or ''),
-            json.dumps(song, ensure_ascii=False)
+            dumps_json(song)
         ))
 
     if not rows:
@@ -461,78 +881,86 @@ def replace_video_songs(cursor, video: dict) -> None:
     ''', rows)
 
 
+def find_existing_video_ids(cursor, video_ids) -> set:
+    """이미 저장된 영상 id를 SQLite 변수 개수 제한에 맞춰 나눠 조회한다."""
+    video_ids = list(video_ids)
+    existing = set()
+    for start in range(0, len(video_ids), SQLITE_IN_CHUNK_SIZE):
+        chunk = video_ids[start:start + SQLITE_IN_CHUNK_SIZE]
+        placeholders = ", ".join("?" for _ in chunk)
+        cursor.execute(f"SELECT id FROM videos WHERE id IN ({placeholders})", chunk)
+        existing.update(row["id"] for row in cursor.fetchall())
+    return existing
+
+
 def insert_videos_transaction(videos: list) -> int:
-    """트랜잭션으로 여러 비디오 삽입"""
+    """트랜잭션으로 여러 비디오 삽입 (기존 영상은 최신 메타데이터로 갱신)"""
+    videos = [video for video in videos if video.get('id')]
     if not videos:
         return 0
-    
-    new_count = 0
+    return retry_locked_write(write_videos_transaction, videos)
+
+
+def insert_video_batches(batches: list) -> list:
+    """여러 동기화 페이지를 한 트랜잭션(커밋 1회)으로 반영하고 페이지별 새 영상 수를 돌려준다."""
+    batches = [[video for video in videos if video.get('id')] for videos in batches]
+    if not any(batches):
+        return [0] * len(batches)
+    return retry_locked_write(write_video_batches, batches)
+
+
+def retry_locked_write(write, *args):
+    """busy_timeout 이후에도 잠겨 있으면 짧게 물러났다가 쓰기를 다시 시도한다."""
+    for attempt in range(SQLITE_WRITE_RETRY_ATTEMPTS):
+        try:
+            return write(*args)
+        except sqlite3.OperationalError as exc:
+            if "locked" not in str(exc) or attempt == SQLITE_WRITE_RETRY_ATTEMPTS - 1:
+                raise
+            delay = SQLITE_WRITE_RETRY_BASE_DELAY * 2 ** attempt
+            logger.warning("Video insert hit a locked database, retrying in %.1fs: %s", delay, exc)
+            time.sleep(delay)
+
+
+def write_videos_transaction(videos: list) -> int:
+    """비디오 묶음을 한 쓰기 트랜잭션으로 반영하고 새 영상 수를 돌려준다."""
+    return write_video_batches([videos])[0]
+
+
+def write_video_batches(batches: list) -> list:
+    """페이지 목록을 한 쓰기 트랜잭션으로 반영한다. 앞 페이지에 있던 id는 뒤 페이지에서 새 영상으로 세지 않는다."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("BEGIN TRANSACTION")
-        
-        for video in videos:
-            channel = video.get('channel') or {}
-            video_id = video.get('id')
-            if not video_id:
-                continue
-
-            json_data = json.dumps(video, ensure_ascii=False)
-            cursor.execute('''
-                UPDATE videos
-                SET title = ?, channel_id = ?, channel_name = ?, published_at = ?, available_at = ?,
-                    duration = ?, status = ?, type = ?, topic_id = ?, json_data = ?
-                WHERE id = ?
-            ''', (
-                video.get('title'),
-                channel.get('id'),
-                channel.get('name', ''),
-                video.get('published_at'),
-                video.get('available_at'),
-                video.get('duration'),
-                video.get('status'),
-                video.get('type'),
-                video.get('topic_id'),
-                json_data,
-                video_id
-            ))
-
-            if cursor.rowcount == 0:
-                cursor.execute('''
-                    INSERT INTO videos
-                    (id, title, channel_id, channel_name, published_at, available_at, duration, status, type, topic_id, json_data)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    video_id,
-                    video.get('title'),
-                    channel.get('id'),
-                    channel.get('name', ''),
-                    video.get('published_at'),
-                    video.get('available_at'),
-                    video.get('duration'),
-                    video.get('status'),
-                    video.get('type'),
-                    video.get('topic_id'),
-                    json_data
-                ))
-                new_count += 1
-
-            replace_video_songs(cursor, video)
-            replace_video_mentions(cursor, video)
-        
-        cursor.execute("COMMIT")
+        # IMMEDIATE로 시작해 읽기→쓰기 승격 중 SQLITE_BUSY(교착 회피)로 바로 실패하지 않게 한다.
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            new_counts = [upsert_videos(cursor, videos) if videos else 0 for videos in batches]
+            cursor.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
         clear_channel_index_cache()
-    
-    return new_count
 
+    return new_counts
 
-def append_video_scope_filter(sql: str, params: list, channel_id: Optional[str], video_type: Optional[str]):
-    """채널 기준 영상 범위를 붙인다."""
-    if not channel_id:
-        return sql, params
 
-    if video_type == "collab":
-        sql += """
+def upsert_videos(cursor, videos: list) -> int:
+    """열린 트랜잭션 안에서 영상/노래/멘션을 반영한다."""
+    video_ids = {video['id'] for video in videos}
+    new_count = len(video_ids) - len(find_existing_video_ids(cursor, video_ids))
+
+    # 같은 SQL을 한 번만 준비하고 행 반복은 sqlite3 C 루프에 맡긴다.
+    cursor.executemany(VIDEO_UPSERT_SQL, (build_video_row(video) for video in videos))
+
+    for video in videos:
+        replace_video_songs(cursor, video)
+        replace_video_mentions(cursor, video)
+
+    return new_count
+
+
+VIDEO_COLLAB_SCOPE_SQL = """
             AND id IN (
                 SELECT own.id
                 FROM videos own
@@ -544,31 +972,20 @@ def append_video_scope_filter(sql: str, params: list, channel_id: Optional[str],
                 WHERE vm.mention_id = ?
             )
         """
-        params.extend([channel_id, channel_id])
-        return sql, params
 
-    sql += " AND channel_id = ?"
-    params.append(channel_id)
-    return sql, params
-
-
-def append_collab_member_filter(sql: str, params: list, collab_member: Optional[str], collab_mode: str):
-    """콜라보 멤버 필터를 멘션 인덱스 기반으로 붙인다."""
-    if not collab_member:
-        return sql, params
-
-    members = [member.strip() for member in collab_member.split(',') if member.strip()]
-    if not members:
-        return sql, params
+VIDEO_SCOPE_SQL = {
+    None: "",
+    "channel": " AND channel_id = ?",
+    "collab": VIDEO_COLLAB_SCOPE_SQL,
+}
 
-    def is_channel_id(value: str) -> bool:
-        return value.startswith("UC")
+TITLE_FILTER_SQL = {
+    None: "",
+    "fts": " AND id IN (SELECT id FROM videos_fts WHERE videos_fts MATCH ?)",
+    "like": " AND title LIKE ?",
+}
 
-    def append_member_condition(member: str):
-        like = f"%{member}%"
-        if is_channel_id(member):
-            return (
-                """
+MEMBER_ID_CONDITION_SQL = """
                     (
                         channel_id = ?
                         OR id IN (
@@ -577,11 +994,9 @@ def append_collab_member_filter(sql: str, params: list, collab_member: Optional[
                             WHERE vm.mention_id = ?
                         )
                     )
-                """,
-                [member, member]
-            )
-        return (
-            """
+                """
+
+MEMBER_NAME_CONDITION_SQL = """
                 (
                     channel_id = ?
                     OR channel_name LIKE ?
@@ -593,24 +1008,163 @@ def append_collab_member_filter(sql: str, params: list, collab_member: Optional[
                            OR vm.mention_english_name LIKE ?
                     )
                 )
-            """,
-            [member, like, member, like, like]
-        )
+            """
 
-    if collab_mode == 'and':
-        for member in members:
-            condition, condition_params = append_member_condition(member)
-            sql += f" AND {condition}"
-            params.extend(condition_params)
-        return sql, params
 
-    conditions = []
+def pad_to_bucket(items: list) -> list:
+    """가변 길이 조건 목록을 2의 거듭제곱 길이로 맞춘다.
+
+    마지막 항목을 반복하므로 OR/AND 어느 쪽으로 묶어도 결과는 같고,
+    SQL 모양 수가 줄어 sqlite3 문장 캐시 적중률이 올라간다.
+    """
+    if len(items) < 2:
+        return items
+    bucket = 1 << (len(items) - 1).bit_length()
+    return items + [items[-1]] * (bucket - len(items))
+
+
+def video_scope_shape(channel_id: Optional[str], video_type: Optional[str]):
+    """채널 기준 영상 범위의 모양과 파라미터"""
+    if not channel_id:
+        return None, []
+    if video_type == "collab":
+        return "collab", [channel_id, channel_id]
+    return "channel", [channel_id]
+
+
+def title_filter_shape(query: Optional[str]):
+    """제목 검색어를 FTS5 trigram 인덱스(3자 이상) 또는 LIKE 모양으로 나눈다."""
+    if not query:
+        return None, []
+    if title_fts_enabled and len(query) >= TITLE_FTS_MIN_QUERY_LENGTH:
+        return "fts", ['"' + query.replace('"', '""') + '"']
+    return "like", [f"%{query}%"]
+
+
+def build_year_month_ranges(filter_years: Optional[list], filter_months: Optional[list] = None) -> list:
+    """선택한 년/월을 available_at 반열린 구간 목록으로 바꾸고 이어진 구간은 합친다."""
+    if not filter_years:
+        return []
+
+    years = sorted({int(year) for year in filter_years})
+    months = sorted({int(month) for month in filter_months or []})
+    if months:
+        bounds = [
+            (f"{year}-{month:02d}", f"{year + month // 12}-{month % 12 + 1:02d}")
+            for year in years
+            for month in months
+        ]
+    else:
+        bounds = [(f"{year}", f"{year + 1}") for year in years]
+
+    ranges = []
+    for lower, upper in bounds:
+        if ranges and ranges[-1][1] == lower:
+            ranges[-1] = (ranges[-1][0], upper)
+        else:
+            ranges.append((lower, upper))
+    return ranges
+
+
+def year_bounds(year) -> tuple[str, str]:
+    """한 해를 available_at 반열린 구간 ('2024', '2025')으로 바꾼다."""
+    return build_year_month_ranges([year])[0]
+
+
+def collab_member_shape(collab_member: Optional[str]):
+    """콜라보 멤버 목록을 (종류 튜플, 파라미터)로 나눈다. 종류는 'id' 또는 'name'."""
+    if not collab_member:
+        return (), []
+
+    members = pad_to_bucket([member.strip() for member in collab_member.split(',') if member.strip()])
+    kinds = []
+    params = []
     for member in members:
-        condition, condition_params = append_member_condition(member)
-        conditions.append(condition)
-        params.extend(condition_params)
-    sql += f" AND ({' OR '.join(conditions)})"
-    return sql, params
+        if member.startswith("UC"):
+            kinds.append("id")
+            params.extend([member, member])
+        else:
+            like = f"%{member}%"
+            kinds.append("name")
+            params.extend([member, like, member, like, like])
+    return tuple(kinds), params
+
+
+@lru_cache(maxsize=256)
+def build_video_search_sql(signature: tuple) -> str:
+    """필터 모양(signature)별 WHERE 절을 한 번만 만들어 재사용한다.
+
+    같은 SQL 문자열이면 sqlite3 연결의 문장 캐시가 파싱/계획을 재사용한다.
+    """
+    scope, title, music_only, hide_unarchived, range_count, date_count, member_kinds, collab_mode = signature
+    sql = VIDEO_SCOPE_SQL[scope] + TITLE_FILTER_SQL[title]
+
+    # 비디오 타입 필터 (노래: Original_Song + Music_Cover)
+    if music_only:
+        sql += " AND topic_id IN ('Original_Song', 'Music_Cover')"
+
+    # 언아카이브 영상 제외 (status가 'missing'이거나 placeholder thumbnail)
+    if hide_unarchived:
+        sql += " AND status != 'missing'"
+        # topic_id가 명시적으로 null인 영상은 placeholder로 본다.
+        # 컬럼으로 먼저 거르고, NULL인 행만 JSON에서 키 누락과 null을 구분한다.
+        sql += " AND (topic_id IS NOT NULL OR json_type(json_data, '$.topic_id') IS NULL)"
+
+    # 년/월 다중 필터: ISO 문자열 available_at에 인덱스 범위 탐색이 가능한 조건
+    if range_count:
+        sql += f" AND ({' OR '.join(['(available_at >= ? AND available_at < ?)'] * range_count)})"
+
+    # 날짜 필터: available_at이 해당 날짜로 시작하는 영상
+    if date_count:
+        sql += f" AND ({' OR '.join(['available_at LIKE ?'] * date_count)})"
+
+    if member_kinds:
+        conditions = [
+            MEMBER_ID_CONDITION_SQL if kind == "id" else MEMBER_NAME_CONDITION_SQL
+            for kind in member_kinds
+        ]
+        if collab_mode == 'and':
+            sql += "".join(f" AND {condition}" for condition in conditions)
+        else:
+            sql += f" AND ({' OR '.join(conditions)})"
+    return sql
+
+
+def build_video_search_where(query: Optional[str], channel_id: Optional[str], collab_member: Optional[str] = None, collab_mode: str = "or", hide_unarchived: bool = False, filter_dates: Optional[list] = None, filter_years: Optional[list] = None, filter_months: Optional[list] = None, video_type: Optional[str] = None):
+    """비디오 검색/카운트가 함께 쓰는 WHERE 절(' AND ...' 목록)과 파라미터를 만든다."""
+    scope, params = video_scope_shape(channel_id, video_type)
+
+    title, title_params = title_filter_shape(query)
+    params.extend(title_params)
+
+    # 년/월 다중 필터: 년도가 선택된 경우에만 적용 (월만 선택 시 무시)
+    ranges = pad_to_bucket(build_year_month_ranges(filter_years, filter_months))
+    for lower, upper in ranges:
+        params.extend([lower, upper])
+
+    dates = pad_to_bucket([f"{date}%" for date in filter_dates or []])
+    params.extend(dates)
+
+    member_kinds, member_params = collab_member_shape(collab_member)
+    params.extend(member_params)
+
+    signature = (
+        scope,
+        title,
+        video_type == 'music',
+        bool(hide_unarchived),
+        len(ranges),
+        len(dates),
+        member_kinds,
+        'and' if collab_mode == 'and' else 'or',
+    )
+    return build_video_search_sql(signature), params
+
+
+def count_videos_where(cursor, where_sql: str, params: list) -> int:
+    cursor.execute(f"SELECT COUNT(*) AS count FROM videos WHERE 1=1 {where_sql}", params)
+    row = cursor.fetchone()
+    return row['count'] if row else 0
 
 
 def search_videos(query: Optional[str], channel_id: Optional[str], limit: int = 32, offset: int = 0, collab_member: Optional[str] = None, collab_mode: str = "or", hide_unarchived: bool = False, filter_dates: Optional[list] = None, filter_years: Optional[list] = None, filter_months: Optional[list] = None, video_type: Optional[str] = None) -> list:
@@ -623,121 +1177,65 @@ def search_videos(query: Optional[str], channel_id: Optional[str], limit: int =
     filter_months: 월 목록 (빠른 선택 다중)
     video_type: 'music'이면 노래(Original_Song, Music_Cover)만 필터링
     """
+    where_sql, params = build_video_search_where(query, channel_id, collab_member, collab_mode, hide_unarchived, filter_dates, filter_years, filter_months, video_type)
     with get_connection() as conn:
         cursor = conn.cursor()
-        
-        sql = "SELECT json_data FROM videos WHERE 1=1"
-        params = []
-        
-        sql, params = append_video_scope_filter(sql, params, channel_id, video_type)
-        
-        if query:
-            sql += " AND title LIKE ?"
-            params.append(f"%{query}%")
-        
-        # 비디오 타입 필터 (노래: Original_Song + Music_Cover)
-        if video_type == 'music':
-            sql += " AND topic_id IN ('Original_Song', 'Music_Cover')"
-        
-        # 언아카이브 영상 제외 (status가 'missing'이거나 placeholder thumbnail)
-        if hide_unarchived:
-            sql += " AND status != 'missing'"
-            # placeholder 썸네일은 'mqdefault' 패턴이 없는 경우로 추정
-            sql += " AND json_data NOT LIKE '%\"topic_id\": null%'"
-        
-        # 년/월 다중 필터: 년도가 선택된 경우에만 적용 (월은 년도 필수)
-        if filter_years and len(filter_years) > 0:
-            year_month_conditions = []
-            if filter_months and len(filter_months) > 0:
-                # 년도+월 조합: 각 년도와 각 월의 조합
-                for year in filter_years:
-                    for month in filter_months:
-                        year_month_prefix = f"{year}-{month:02d}"
-                        year_month_conditions.append("available_at LIKE ?")
-                        params.append(f"{year_month_prefix}%")
-            else:
-                # 년도만 필터: 각 년도의 모든 영상
-                for year in filter_years:
-                    year_month_conditions.append("available_at LIKE ?")
-                    params.append(f"{year}-%")
-            sql += f" AND ({' OR '.join(year_month_conditions)})"
-        # 월만 선택 시 무시 (년도 필수)
-        
-        # 날짜 필터: 선택된 날짜에 해당하는 영상만
-        if filter_dates and len(filter_dates) > 0:
-            date_conditions = []
-            for date in filter_dates:
-                # available_at이 해당 날짜로 시작하는 영상
-                date_conditions.append("available_at LIKE ?")
-                params.append(f"{date}%")
-            sql += f" AND ({' OR '.join(date_conditions)})"
-        
-        sql, params = append_collab_member_filter(sql, params, collab_member, collab_mode)
-        
-        sql += " ORDER BY available_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-        
-        cursor.execute(sql, params)
-        rows = cursor.fetchall()
-        
-        return [json.loads(row['json_data']) for row in rows]
+        cursor.execute(
+            f"SELECT json_data FROM videos WHERE 1=1 {where_sql} ORDER BY available_at DESC LIMIT ? OFFSET ?",
+            [*params, limit, offset]
+        )
+        return [loads_json(row['json_data']) for row in cursor]
+
+
+def search_videos_with_total(query: Optional[str], channel_id: Optional[str], limit: int = 32, offset: int = 0, collab_member: Optional[str] = None, collab_mode: str = "or", hide_unarchived: bool = False, filter_dates: Optional[list] = None, filter_years: Optional[list] = None, filter_months: Optional[list] = None, video_type: Optional[str] = None) -> tuple[list, int]:
+    """검색 결과 한 페이지와 전체 개수를 WHERE 절 한 번 평가로 함께 조회한다. (items, total) 반환"""
+    where_sql, params = build_video_search_where(query, channel_id, collab_member, collab_mode, hide_unarchived, filter_dates, filter_years, filter_months, video_type)
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        # COUNT(*) OVER ()는 id/정렬 키만 담은 서브쿼리에서 계산해 json_data 전체를 버퍼링하지 않는다.
+        cursor.execute(f"""
+            SELECT v.json_data, page.total
+            FROM (
+                SELECT id, available_at, COUNT(*) OVER () AS total
+                FROM videos
+                WHERE 1=1 {where_sql}
+                ORDER BY available_at DESC
+                LIMIT ? OFFSET ?
+            ) page
+            JOIN videos v ON v.id = page.id
+            ORDER BY page.available_at DESC
+        """, [*params, limit, offset])
+        items = []
+        total = 0
+        for row in cursor:
+            items.append(loads_json(row['json_data']))
+            total = row['total']
+        if items:
+            return items, total
+        if offset == 0:
+            return [], 0
+
+        # 마지막 페이지를 넘어선 요청은 윈도 결과가 없으므로 개수만 따로 센다.
+        return [], count_videos_where(cursor, where_sql, params)
 
 
 def count_videos(query: Optional[str], channel_id: Optional[str], collab_member: Optional[str] = None, collab_mode: str = "or", hide_unarchived: bool = False, filter_dates: Optional[list] = None, filter_years: Optional[list] = None, filter_months: Optional[list] = None, video_type: Optional[str] = None) -> int:
     """비디오 개수 조회 (콜라보 멤버 필터, 언아카이브 숨기기, 날짜/년/월 필터, 비디오 타입 필터)"""
+    where_sql, params = build_video_search_where(query, channel_id, collab_member, collab_mode, hide_unarchived, filter_dates, filter_years, filter_months, video_type)
     with get_connection() as conn:
-        cursor = conn.cursor()
-        
-        sql = "SELECT COUNT(*) as count FROM videos WHERE 1=1"
-        params = []
-        
-        sql, params = append_video_scope_filter(sql, params, channel_id, video_type)
-        
-        if query:
-            sql += " AND title LIKE ?"
-            params.append(f"%{query}%")
-        
-        # 비디오 타입 필터 (노래: Original_Song + Music_Cover)
-        if video_type == 'music':
-            sql += " AND topic_id IN ('Original_Song', 'Music_Cover')"
-        
-        # 언아카이브 영상 제외
-        if hide_unarchived:
-            sql += " AND status != 'missing'"
-            sql += " AND json_data NOT LIKE '%\"topic_id\": null%'"
-        
-        # 년/월 다중 필터: 년도가 선택된 경우에만 적용 (월은 년도 필수)
-        if filter_years and len(filter_years) > 0:
-            year_month_conditions = []
-            if filter_months and len(filter_months) > 0:
-                # 년도+월 조합: 각 년도와 각 월의 조합
-                for year in filter_years:
-                    for month in filter_months:
-                        year_month_prefix = f"{year}-{month:02d}"
-                        year_month_conditions.append("available_at LIKE ?")
-                        params.append(f"{year_month_prefix}%")
-            else:
-                # 년도만 필터: 각 년도의 모든 영상
-                for year in filter_years:
-                    year_month_conditions.append("available_at LIKE ?")
-                    params.append(f"{year}-%")
-            sql += f" AND ({' OR '.join(year_month_conditions)})"
-        # 월만 선택 시 무시 (년도 필수)
-        
-        # 날짜 필터: 선택된 날짜에 해당하는 영상만
-        if filter_dates and len(filter_dates) > 0:
-            date_conditions = []
-            for date in filter_dates:
-                date_conditions.append("available_at LIKE ?")
-                params.append(f"{date}%")
-            sql += f" AND ({' OR '.join(date_conditions)})"
-        
-        sql, params = append_collab_member_filter(sql, params, collab_member, collab_mode)
-        
-        cursor.execute(sql, params)
-        row = cursor.fetchone()
-        
-        return row['count'] if row else 0
+        return count_videos_where(conn.cursor(), where_sql, params)
+
+
+SONG_CHANNEL_CONDITION_SQL = """
+    (
+        vs.channel_id = ?
+        OR EXISTS (
+            SELECT 1
+            FROM video_mentions vm
+            WHERE vm.video_id = vs.video_id AND vm.mention_id = ?
+        )
+    )
+"""
 
 
 def build_song_search_where(query: Optional[str], channel_id: Optional[str], collab_member: Optional[str] = None, collab_mode: str = "or"):
@@ -745,16 +1243,7 @@ def build_song_search_where(query: Optional[str], channel_id: Optional[str], col
     sql = " FROM video_songs vs LEFT JOIN videos v ON v.id = vs.video_id WHERE 1=1"
     params = []
     if channel_id:
-        sql += """
-            AND (
-                vs.channel_id = ?
-                OR EXISTS (
-                    SELECT 1
-                    FROM json_each(COALESCE(json_extract(v.json_data, '$.mentions'), '[]')) mention
-                    WHERE json_extract(mention.value, '$.id') = ?
-                )
-            )
-        """
+        sql += f" AND {SONG_CHANNEL_CONDITION_SQL}"
         params.extend([channel_id, channel_id])
     if query:
         like = f"%{query}%"
@@ -763,14 +1252,17 @@ def build_song_search_where(query: Optional[str], channel_id: Optional[str], col
     if collab_member:
         members = [member.strip() for member in collab_member.split(',') if member.strip()]
         if members:
-            if collab_mode == "and":
-                for member in members:
-                    sql += " AND v.json_data LIKE ?"
+            conditions = []
+            for member in members:
+                # 채널 ID는 멘션 인덱스로, 이름은 기존처럼 원본 JSON 부분 일치로 찾는다.
+                if member.startswith("UC"):
+                    conditions.append(SONG_CHANNEL_CONDITION_SQL)
+                    params.extend([member, member])
+                else:
+                    conditions.append("v.json_data LIKE ?")
                     params.append(f"%{member}%")
-            else:
-                conditions = ["v.json_data LIKE ?" for _ in members]
-                sql += f" AND ({' OR '.join(conditions)})"
-                params.extend([f"%{member}%" for member in members])
+            joiner = " AND " if collab_mode == "and" else " OR "
+            sql += f" AND ({joiner.join(conditions)})"
     return sql, params
 
 
@@ -843,8 +1335,8 @@ def selected_member_aliases(row: dict, selected_channel_id: Optional[str]) -> se
         return aliases
 
     try:
-        from channels import CHANNELS
-        channel = next((item for item in CHANNELS if item.get("id") == selected_channel_id), None)
+        from channels import CHANNEL_BY_ID
+        channel = CHANNEL_BY_ID.get(selected_channel_id)
         if channel and channel.get("name"):
             aliases.add(normalize_artist_name(channel["name"]))
     except Exception:
@@ -910,7 +1402,7 @@ def load_song_rows(query: Optional[str], channel_id: Optional[str], sort: str =
         """ + where_sql + get_song_order_sql(sort) + " LIMIT ? OFFSET ?"
         cursor.execute(sql, [*params, 100000, 0])
         songs = []
-        for row in cursor.fetchall():
+        for row in cursor:
             item = dict(row)
             item["category"] = classify_song(item, channel_id) if is_official_song(item) else "all"
             songs.append(item)
@@ -961,7 +1453,7 @@ def song_row_has_allowed_context(row: dict) -> bool:
         if is_allowed_channel_id(row.get("channel_id")):
             return True
 
-        video_data = json.loads(row.get("video_json_data") or "{}")
+        video_data = loads_json(row.get("video_json_data") or "{}")
         mentions = video_data.get("mentions") or []
         return any(
             isinstance(member, dict) and is_allowed_channel_id(member.get("id"))
@@ -1046,7 +1538,7 @@ def get_song_details_response(title: Optional[str], artist: Optional[str] = None
 
         items = []
         seen = set()
-        for row in cursor.fetchall():
+        for row in cursor:
             item = dict(row)
             if not song_row_has_allowed_context(item):
                 continue
@@ -1094,20 +1586,34 @@ def get_latest_video_date(channel_id: str) -> Optional[str]:
 def get_db_signature() -> tuple[int, int]:
     try:
         stat = os.stat(DB_PATH)
-        return stat.st_mtime_ns, stat.st_size
     except OSError:
         return 0, 0
 
+    # WAL 모드에서는 체크포인트 전까지 변경분이 -wal 파일에만 쌓인다.
+    mtime_ns, size = stat.st_mtime_ns, stat.st_size
+    try:
+        wal_stat = os.stat(f"{DB_PATH}-wal")
+        mtime_ns = max(mtime_ns, wal_stat.st_mtime_ns)
+        size += wal_stat.st_size
+    except OSError:
+        pass
+    return mtime_ns, size
+
 
 def clear_channel_index_cache() -> None:
     get_channel_index_for_signature.cache_clear()
 
 
+def latest_value_sql(column: str, partition: str) -> str:
+    """파티션 안에서 값이 있는 가장 최근(available_at) 행의 column 값을 고르는 윈도 함수 SQL"""
+    return f"FIRST_VALUE({column}) OVER (PARTITION BY {partition} ORDER BY {column} IS NULL, available_at DESC)"
+
+
 def build_channel_index() -> list:
     """DB에 쌓인 호스트/멘션 채널 목록을 반환한다."""
     channels = {}
 
-    def remember(channel_id, name="", photo="", org=""):
+    def remember(channel_id, name="", photo="", org="", count=1):
         if not channel_id or not str(channel_id).startswith("UC"):
             return
         current = channels.get(channel_id, {})
@@ -1118,40 +1624,60 @@ def build_channel_index() -> list:
             "photo": current.get("photo") or photo or "",
             "icon": f"/channel-icons/{channel_id}.png",
             "org": current.get("org") or org or "Hololive",
-            "count": int(current.get("count") or 0) + 1,
+            "count": int(current.get("count") or 0) + count,
         }
 
+    # 원본 JSON은 SQLite JSON1(C)에서 채널 단위로 집계하고, 멘션은 정규화 테이블에서 읽는다.
+    # 이름/사진/org는 값이 있는 가장 최근 방송 기준으로 골라 채널명 변경을 따라간다.
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT channel_id, channel_name, json_data
-            FROM videos
-            WHERE json_data IS NOT NULL
-        """)
-
-        for row in cursor.fetchall():
-            try:
-                data = json.loads(row["json_data"] or "{}")
-            except (json.JSONDecodeError, TypeError):
-                data = {}
-
-            channel = data.get("channel") or {}
-            remember(
-                row["channel_id"] or channel.get("id"),
-                row["channel_name"] or channel.get("name") or channel.get("english_name"),
-                channel.get("photo") or "",
-                channel.get("org") or "",
+        cursor.execute(f"""
+            SELECT channel_id, MAX(name) AS name, MAX(photo) AS photo, MAX(org) AS org, COUNT(*) AS count
+            FROM (
+                SELECT channel_id,
+                       {latest_value_sql("name", "channel_id")} AS name,
+                       {latest_value_sql("photo", "channel_id")} AS photo,
+                       {latest_value_sql("org", "channel_id")} AS org
+                FROM (
+                    SELECT COALESCE(channel_id, json_extract(json_data, '$.channel.id')) AS channel_id,
+                           available_at,
+                           COALESCE(
+                               NULLIF(channel_name, ''),
+                               NULLIF(json_extract(json_data, '$.channel.name'), ''),
+                               NULLIF(json_extract(json_data, '$.channel.english_name'), '')
+                           ) AS name,
+                           NULLIF(json_extract(json_data, '$.channel.photo'), '') AS photo,
+                           NULLIF(json_extract(json_data, '$.channel.org'), '') AS org
+                    FROM videos
+                    WHERE json_data IS NOT NULL
+                )
             )
-
-            for member in data.get("mentions") or []:
-                if not isinstance(member, dict):
-                    continue
-                remember(
-                    member.get("id"),
-                    member.get("name") or member.get("english_name"),
-                    member.get("photo") or "",
-                    member.get("org") or "",
+            GROUP BY channel_id
+        """)
+        for row in cursor:
+            remember(row["channel_id"], row["name"], row["photo"], row["org"], row["count"])
+
+        cursor.execute(f"""
+            SELECT mention_id, MAX(name) AS name, MAX(photo) AS photo, MAX(org) AS org, COUNT(*) AS count
+            FROM (
+                SELECT mention_id,
+                       {latest_value_sql("name", "mention_id")} AS name,
+                       {latest_value_sql("photo", "mention_id")} AS photo,
+                       {latest_value_sql("org", "mention_id")} AS org
+                FROM (
+                    SELECT vm.mention_id,
+                           v.available_at,
+                           COALESCE(NULLIF(vm.mention_name, ''), NULLIF(vm.mention_english_name, '')) AS name,
+                           NULLIF(vm.mention_photo, '') AS photo,
+                           NULLIF(json_extract(vm.raw_json, '$.org'), '') AS org
+                    FROM video_mentions vm
+                    LEFT JOIN videos v ON v.id = vm.video_id
                 )
+            )
+            GROUP BY mention_id
+        """)
+        for row in cursor:
+            remember(row["mention_id"], row["name"], row["photo"], row["org"], row["count"])
 
     return sorted(channels.values(), key=lambda item: item["name"].casefold())
 
@@ -1166,180 +1692,100 @@ def get_channel_index() -> list:
     return [dict(item) for item in cached_items]
 
 
-def get_yearly_stats(channel_id: str) -> list:
-    """년도별 방송 개수 집계"""
+def query_yearly_month_stats(channel_id: str, column: str) -> list:
+    """channel_month_stats에서 년도별 합계를 읽는다. 값이 0인 년도는 제외"""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT strftime('%Y', available_at) as year, COUNT(*) as count 
-            FROM videos 
-            WHERE channel_id = ? 
-            GROUP BY year 
+        cursor.execute(f"""
+            SELECT year, SUM({column}) as count
+            FROM channel_month_stats
+            WHERE channel_id = ? AND year > 0
+            GROUP BY year
+            HAVING count > 0
             ORDER BY year
         """, (channel_id,))
-        return [{"year": row["year"], "count": row["count"]} for row in cursor.fetchall()]
+        return [{"year": str(row["year"]), "count": row["count"]} for row in cursor.fetchall()]
 
 
-def get_monthly_stats(channel_id: str, year: str) -> list:
-    """월별 방송 개수 집계"""
+def query_monthly_stats(channel_id: str, year: str, column: str) -> list:
+    """channel_month_stats에서 한 해의 월별 값을 읽어 12개월을 채운다."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT strftime('%m', available_at) as month, COUNT(*) as count 
-            FROM videos 
-            WHERE channel_id = ? 
-            AND strftime('%Y', available_at) = ?
-            GROUP BY month 
-            ORDER BY month
-        """, (channel_id, year))
+        cursor.execute(f"""
+            SELECT month, {column} as count
+            FROM channel_month_stats
+            WHERE channel_id = ? AND year = ?
+        """, (channel_id, int(year)))
         # 12개월 전체를 채워서 반환 (없는 월은 0)
-        result = {f"{i:02d}": 0 for i in range(1, 13)}
+        result = {month: 0 for month in range(1, 13)}
         for row in cursor.fetchall():
-            result[row["month"]] = row["count"]
-        return [{"month": int(m), "count": c} for m, c in result.items()]
+            if row["month"] in result:
+                result[row["month"]] = row["count"]
+        return [{"month": m, "count": c} for m, c in result.items()]
+
+
+def get_yearly_stats(channel_id: str) -> list:
+    """년도별 방송 개수 집계"""
+    return query_yearly_month_stats(channel_id, "total")
+
+
+def get_monthly_stats(channel_id: str, year: str) -> list:
+    """월별 방송 개수 집계"""
+    return query_monthly_stats(channel_id, year, "total")
 
 
 def get_yearly_membership_stats(channel_id: str) -> list:
     """년도별 멤버십 방송 개수 집계"""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT strftime('%Y', available_at) as year, COUNT(*) as count 
-            FROM videos 
-            WHERE channel_id = ? 
-            AND (
-                json_extract(json_data, '$.topic_id') = 'membersonly'
-                OR title LIKE '%メン限%' 
-                OR title LIKE '%Members%' 
-                OR title LIKE '%メンバー限定%' 
-                OR title LIKE '%멤버십%' 
-                OR title LIKE '%Membersonly%'
-            )
-            GROUP BY year 
-            ORDER BY year
-        """, (channel_id,))
-        return [{"year": row["year"], "count": row["count"]} for row in cursor.fetchall()]
+    return query_yearly_month_stats(channel_id, "membership")
 
 
 def get_monthly_membership_stats(channel_id: str, year: str) -> list:
     """월별 멤버십 방송 통계 (topic_id + 제목 키워드 병용)"""
+    return query_monthly_stats(channel_id, year, "membership")
+
+
+def query_collab_stats(channel_id: str, year_sql: str = "", params: tuple = ()) -> list:
+    """video_mentions 정규화 테이블에서 콜라보 멤버별 횟수를 한 번에 집계한다."""
     with get_connection() as conn:
         cursor = conn.cursor()
-        # json_data의 topic_id가 'membersonly'이거나 제목에 멤버십 키워드 포함
-        cursor.execute("""
-            SELECT strftime('%m', available_at) as month, COUNT(*) as count 
-            FROM videos 
-            WHERE channel_id = ? 
-            AND strftime('%Y', available_at) = ?
-            AND (
-                json_extract(json_data, '$.topic_id') = 'membersonly'
-                OR title LIKE '%メン限%' 
-                OR title LIKE '%Members%' 
-                OR title LIKE '%メンバー限定%' 
-                OR title LIKE '%멤버십%' 
-                OR title LIKE '%Membersonly%'
-            )
-            GROUP BY month 
-            ORDER BY month
-        """, (channel_id, year))
-        # 12개월 전체를 채워서 반환 (없는 월은 0)
-        result = {f"{i:02d}": 0 for i in range(1, 13)}
-        for row in cursor.fetchall():
-            result[row["month"]] = row["count"]
-        return [{"month": int(m), "count": c} for m, c in result.items()]
+        cursor.execute(f"""
+            SELECT vm.mention_id AS id,
+                   COALESCE(MAX(NULLIF(vm.mention_name, '')), MAX(NULLIF(vm.mention_english_name, '')), 'Unknown') AS name,
+                   COALESCE(MAX(NULLIF(vm.mention_photo, '')), '') AS photo,
+                   COUNT(*) AS count
+            FROM video_mentions vm
+            JOIN videos v ON v.id = vm.video_id
+            WHERE v.channel_id = ?
+            {year_sql}
+            GROUP BY vm.mention_id
+            ORDER BY count DESC, vm.mention_id
+            LIMIT 30
+        """, (channel_id, *params))
+        return [dict(row) for row in cursor.fetchall()]
 
 
 def get_collab_stats(channel_id: str) -> list:
-    """콜라보 멤버별 횟수 집계 (mentions 필드 활용, photo URL 포함)"""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        # json_data에서 mentions 추출
-        cursor.execute("""
-            SELECT json_data FROM videos 
-            WHERE channel_id = ? AND json_data IS NOT NULL
-        """, (channel_id,))
-        
-        collab_counts = {}
-        for row in cursor.fetchall():
-            try:
-                data = json.loads(row["json_data"])
-                mentions = data.get("mentions", [])
-                for member in mentions:
-                    member_id = member.get("id")
-                    member_name = member.get("name") or member.get("english_name", "Unknown")
-                    member_photo = member.get("photo", "")  # photo URL 추가
-                    if member_id:
-                        if member_id not in collab_counts:
-                            collab_counts[member_id] = {
-                                "id": member_id,
-                                "name": member_name,
-                                "photo": member_photo,  # photo 필드 추가
-                                "count": 0
-                            }
-                        collab_counts[member_id]["count"] += 1
-                        # photo가 없으면 업데이트 (나중에 찾은 photo로)
-                        if not collab_counts[member_id]["photo"] and member_photo:
-                            collab_counts[member_id]["photo"] = member_photo
-            except (json.JSONDecodeError, TypeError):
-                continue
-        
-        # 횟수 기준 내림차순 정렬 후 상위 30개 반환
-        sorted_collabs = sorted(collab_counts.values(), key=lambda x: x["count"], reverse=True)
-        return sorted_collabs[:30]
+    """콜라보 멤버별 횟수 집계 (mentions 필드 활용, photo URL 포함) - 상위 30개"""
+    return query_collab_stats(channel_id)
 
 
 def get_yearly_collab_stats(channel_id: str, year: str) -> list:
-    """특정 연도의 콜라보 멤버별 횟수 집계 (photo URL 포함)"""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT json_data FROM videos 
-            WHERE channel_id = ? 
-            AND json_data IS NOT NULL
-            AND strftime('%Y', available_at) = ?
-        """, (channel_id, year))
-        
-        collab_counts = {}
-        for row in cursor.fetchall():
-            try:
-                data = json.loads(row["json_data"])
-                mentions = data.get("mentions", [])
-                for member in mentions:
-                    member_id = member.get("id")
-                    member_name = member.get("name") or member.get("english_name", "Unknown")
-                    member_photo = member.get("photo", "")  # photo URL 추가
-                    if member_id:
-                        if member_id not in collab_counts:
-                            collab_counts[member_id] = {
-                                "id": member_id,
-                                "name": member_name,
-                                "photo": member_photo,  # photo 필드 추가
-                                "count": 0
-                            }
-                        collab_counts[member_id]["count"] += 1
-                        # photo가 없으면 업데이트
-                        if not collab_counts[member_id]["photo"] and member_photo:
-                            collab_counts[member_id]["photo"] = member_photo
-            except (json.JSONDecodeError, TypeError):
-                continue
-        
-        # 횟수 기준 내림차순 정렬 후 상위 30개 반환
-        sorted_collabs = sorted(collab_counts.values(), key=lambda x: x["count"], reverse=True)
-        return sorted_collabs[:30]
+    """특정 연도의 콜라보 멤버별 횟수 집계 (photo URL 포함) - 상위 30개"""
+    return query_collab_stats(channel_id, "AND v.available_at >= ? AND v.available_at < ?", year_bounds(year))
 
 
 def get_topic_stats(channel_id: str) -> list:
     """전체 topic(컨텐츠/게임) 통계 - TOP 10"""
     with get_connection() as conn:
         cursor = conn.cursor()
-        # membersonly, shorts, announce 등 컨텐츠가 아닌 태그 제외
+        # excluded_topics에 등록된 membersonly, shorts 등 컨텐츠가 아닌 태그 제외
         cursor.execute("""
             SELECT topic_id, COUNT(*) as cnt 
             FROM videos 
             WHERE channel_id = ? 
             AND topic_id IS NOT NULL 
             AND topic_id != ''
-            AND topic_id NOT IN ('membersonly', 'shorts', 'announce', 'Original_Song', 'Music_Cover', 'watchalong', 'morning')
+            AND NOT EXISTS (SELECT 1 FROM excluded_topics et WHERE et.topic_id = videos.topic_id)
             GROUP BY topic_id 
             ORDER BY cnt DESC 
             LIMIT 10
@@ -1351,22 +1797,17 @@ def get_yearly_topic_stats(channel_id: str, year: str) -> list:
     """연도별 topic(컨텐츠/게임) 통계 - TOP 10"""
     with get_connection() as conn:
         cursor = conn.cursor()
-        # membersonly, shorts, announce 등 컨텐츠가 아닌 태그 제외
+        # excluded_topics에 등록된 membersonly, shorts 등 컨텐츠가 아닌 태그 제외
         cursor.execute("""
             SELECT topic_id, COUNT(*) as cnt 
             FROM videos 
             WHERE channel_id = ? 
-            AND strftime('%Y', available_at) = ?
+            AND available_at >= ? AND available_at < ?
             AND topic_id IS NOT NULL 
             AND topic_id != ''
-            AND topic_id NOT IN ('membersonly', 'shorts', 'announce', 'Original_Song', 'Music_Cover', 'watchalong', 'morning')
+            AND NOT EXISTS (SELECT 1 FROM excluded_topics et WHERE et.topic_id = videos.topic_id)
             GROUP BY topic_id 
             ORDER BY cnt DESC 
             LIMIT 10
-        """, (channel_id, year))
+        """, (channel_id, *year_bounds(year)))
         return [{"topic": row[0], "count": row[1]} for row in cursor.fetchall()]
-
-
-# 모듈 로드 시 DB 초기화
-init_db()
-
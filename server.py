@@ -6,23 +6,69 @@ FastAPI 기반 웹 서버 - Holodex API 프록시 및 로컬 DB 검색
 import asyncio
 import hmac
 import json
+import logging
 import os
+import queue
+import random
 import re
 import time
+from email.utils import formatdate, parsedate_to_datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
 from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import FastAPI, Request, BackgroundTasks, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import httpx
-from cachetools import TTLCache
+from cachetools import TLRUCache, TTLCache
 
 import database as db
 from allowed_channels import is_allowed_channel_id
-from channels import CHANNEL_IDS
+from channels import CHANNEL_BY_ID, CHANNEL_IDS
+
+# --- 로깅: 동기화/프록시 핫패스는 logging으로, 실제 출력은 백그라운드 스레드에서 ---
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "WARNING").strip().upper() or "WARNING"
+logger = logging.getLogger(__name__)
+log_queue = queue.SimpleQueue()
+log_listener: Optional[QueueListener] = None
+log_queue_handler: Optional[QueueHandler] = None
+
+
+def resolve_log_level(name: str) -> int:
+    """LOG_LEVEL 이름을 숫자 레벨로 바꾼다. 오타면 기동을 막지 않고 WARNING으로 둔다."""
+    level = logging.getLevelName(name)
+    return level if isinstance(level, int) else logging.WARNING
+
+
+def start_log_listener() -> None:
+    """루트 로거는 큐에만 넣고, stdout 쓰기는 QueueListener 스레드가 맡는다."""
+    global log_listener, log_queue_handler
+    if log_listener is not None:
+        return
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    # QueueHandler는 메시지만 채우고 시간/레벨 형식은 출력 쪽 핸들러가 붙인다.
+    log_queue_handler = QueueHandler(log_queue)
+    log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=resolve_log_level(LOG_LEVEL), handlers=[log_queue_handler])
+    log_listener = QueueListener(log_queue, stream_handler)
+    log_listener.start()
+
+
+def stop_log_listener() -> None:
+    global log_listener, log_queue_handler
+    if log_listener is not None:
+        log_listener.stop()
+    # 리스너가 멈춘 뒤에도 큐에 레코드가 쌓이지 않도록 루트 로거에서 떼어낸다.
+    if log_queue_handler is not None:
+        logging.getLogger().removeHandler(log_queue_handler)
+    log_listener = None
+    log_queue_handler = None
+
 
 # --- 성능 최적화: orjson 사용 (더 빠른 JSON 파싱) ---
 try:
@@ -31,16 +77,116 @@ try:
 except ImportError:
     HAS_ORJSON = False
 
+# --- HTTP/2: httpx[http2]의 h2가 있으면 Holodex 요청을 한 TLS 연결에 다중화 ---
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+# --- 선택: Redis (여러 uvicorn 워커가 rate limit 카운터와 프록시 캐시를 공유) ---
+try:
+    import redis.asyncio as redis_asyncio
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
 # --- LRU/TTL Cache (확장) ---
-cache = TTLCache(maxsize=1000, ttl=60)  # 캐시 크기 확장
+# 프록시 캐시 값은 (status, content_type, body, ttl)이며 항목마다 ttl 뒤에 만료된다.
+cache = TLRUCache(maxsize=1000, ttu=lambda _key, value, now: now + value[3])
+PROXY_CACHE_DEFAULT_TTL_SECONDS = 60
+# 라이브/예정은 자주 바뀌고, 영상 목록은 조금 더 오래 재사용해도 된다.
+PROXY_CACHE_TTL_SECONDS = {
+    "live": 30,
+    "videos": 120,
+}
 
 # --- Thread Pool for DB Operations ---
-db_executor = ThreadPoolExecutor(max_workers=4)
+# 연결은 스레드마다 하나씩 재사용하고 WAL이라 읽기끼리는 서로 막지 않는다.
+# 다만 연결마다 페이지 캐시(cache_size=-64000, 약 64MB)를 따로 가지므로
+# 기본 8개로 묶어 DB 스레드 페이지 캐시 총량을 약 512MB 이하로 둔다.
+DB_EXECUTOR_WORKERS = max(1, int(os.environ.get("DB_EXECUTOR_WORKERS", "8")))
+db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
+
+async def run_db(func, *args):
+    """동기 SQLite 함수를 DB 스레드 풀에서 실행한다."""
+    return await asyncio.get_running_loop().run_in_executor(db_executor, func, *args)
+
+
+# --- 동기화 쓰기 큐 (여러 채널의 페이지를 모아 한 번에 커밋) ---
+VIDEO_WRITE_BATCH_MAX_ROWS = 1000
+video_write_queue: Optional[asyncio.Queue] = None
+
+
+async def video_writer_loop(queue: asyncio.Queue) -> None:
+    """쓰기 큐에 쌓인 페이지를 최대 VIDEO_WRITE_BATCH_MAX_ROWS행씩 한 트랜잭션으로 반영한다."""
+    while True:
+        videos, future = await queue.get()
+        pending = [(videos, future)]
+        row_count = len(videos)
+        while row_count < VIDEO_WRITE_BATCH_MAX_ROWS:
+            try:
+                videos, future = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            pending.append((videos, future))
+            row_count += len(videos)
+
+        try:
+            await write_pending_videos(pending)
+        except asyncio.CancelledError:
+            # 종료 중이면 기다리던 동기화 작업이 멈춰 있지 않도록 함께 취소한다.
+            for _, future in pending:
+                future.cancel()
+            raise
+
+
+async def write_pending_videos(pending: list) -> None:
+    """모은 페이지를 한 번에 쓰고, 각 페이지의 Future에 새 영상 수를 알려 준다."""
+    try:
+        new_counts = await run_db(db.insert_video_batches, [videos for videos, _ in pending])
+    except Exception as e:
+        if len(pending) == 1:
+            set_future_exception(pending[0][1], e)
+            return
+        # 묶음 전체가 실패하면 한 채널의 문제가 다른 채널로 번지지 않게 페이지별로 다시 쓴다.
+        logger.warning("Batched video insert failed, retrying per page: %s", e)
+        for videos, future in pending:
+            try:
+                set_future_result(future, await run_db(db.insert_videos_transaction, videos))
+            except Exception as page_error:
+                set_future_exception(future, page_error)
+        return
+
+    for (_, future), new_count in zip(pending, new_counts):
+        set_future_result(future, new_count)
+
+
+def set_future_result(future: asyncio.Future, value) -> None:
+    if not future.done():
+        future.set_result(value)
+
+
+def set_future_exception(future: asyncio.Future, exc: Exception) -> None:
+    if not future.done():
+        future.set_exception(exc)
+
+
+async def insert_synced_videos(videos: list) -> int:
+    """동기화 페이지를 쓰기 큐에 넣고, 커밋 후 새 영상 수를 돌려받는다."""
+    if video_write_queue is None:
+        return await run_db(db.insert_videos_transaction, videos)
+    future = asyncio.get_running_loop().create_future()
+    await video_write_queue.put((videos, future))
+    return await future
 
 # --- Environment Flags ---
 IS_PRODUCTION = bool(os.environ.get("RAILWAY_ENVIRONMENT") or os.environ.get("NODE_ENV") == "production")
 # 정적 프론트엔드 원본은 로컬/배포 모두 public/ 하나만 사용한다.
 STATIC_DIR = os.environ.get("STATIC_DIR", "public").strip() or "public"
+# 앞단(nginx/Cloudflare 등)이 public/을 직접 서빙하면 false로 두어 정적 요청이 미들웨어를 거치지 않게 한다.
+SERVE_STATIC = os.environ.get("SERVE_STATIC", "true").lower() in {"1", "true", "yes"}
 CHANNEL_IMAGE_CACHE_DIR = os.path.join(
     os.environ.get("RAILWAY_VOLUME_MOUNT_PATH", "").strip() or db.DB_DIR or ".",
     "channel_img_cache",
@@ -85,11 +231,18 @@ def has_strong_admin_token() -> bool:
 
 
 def get_client_ip(request: Request) -> str:
+    # 미들웨어에서 한 번 계산한 값을 같은 요청의 이후 호출이 재사용한다.
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip:
+        return client_ip
     # 프록시 헤더는 명시적으로 신뢰할 때만 사용한다.
     cf_ip = request.headers.get("CF-Connecting-IP") if TRUST_PROXY_HEADERS else None
     if cf_ip and re.fullmatch(r"[0-9A-Fa-f:.]{3,45}", cf_ip):
-        return cf_ip
-    return request.client.host if request.client else "unknown"
+        client_ip = cf_ip
+    else:
+        client_ip = request.client.host if request.client else "unknown"
+    request.state.client_ip = client_ip
+    return client_ip
 
 
 def is_local_request(request: Request) -> bool:
@@ -128,7 +281,7 @@ async def read_limited_json(request: Request, max_bytes: int):
         return {}
 
     try:
-        return json.loads(body)
+        return db.loads_json(body)
     except json.JSONDecodeError as exc:
         raise HTTPException(status_code=400, detail="Invalid JSON") from exc
 
@@ -273,55 +426,201 @@ def is_blocked_static_path(path: str) -> bool:
     return any(normalized.endswith(suffix) for suffix in BLOCKED_STATIC_SUFFIXES)
 
 
+# 정적 파일 캐시 정책 (Cloudflare Edge + 브라우저)
+# s-maxage = CDN 캐시, max-age = 브라우저 캐시
+HTML_CACHE_CONTROL = "public, max-age=60, s-maxage=300"  # HTML: 짧은 캐시 (배포 후 빠른 반영)
+NO_STORE_CACHE_CONTROL = "no-store, max-age=0"  # JS/CSS는 파일명 해시가 없어서 CDN에도 보관하지 않는다.
+IMAGE_CACHE_CONTROL = "public, max-age=86400, s-maxage=604800"  # 이미지: 장기 캐시
+STATIC_CACHE_CONTROL_BY_EXT = {
+    "html": HTML_CACHE_CONTROL,
+    "js": NO_STORE_CACHE_CONTROL,
+    "css": NO_STORE_CACHE_CONTROL,
+    **{ext: IMAGE_CACHE_CONTROL for ext in ("png", "jpg", "jpeg", "gif", "svg", "ico", "webp")},
+}
+
+
+def get_static_cache_control(path: str) -> Optional[str]:
+    if path == "/":
+        return HTML_CACHE_CONTROL
+    return STATIC_CACHE_CONTROL_BY_EXT.get(path.rpartition(".")[2])
+
+
 # --- 보안: Rate Limiting (D-05) ---
-rate_limit_cache = TTLCache(maxsize=1000, ttl=60)  # IP별 요청 횟수 (1분)
+RATE_LIMIT_WINDOW_SECONDS = 60
+rate_limit_cache = TTLCache(maxsize=1000, ttl=RATE_LIMIT_WINDOW_SECONDS)  # IP별 요청 횟수 (1분)
+# 이미 한도를 넘긴 클라이언트는 잠깐 동안 Redis 왕복 없이 바로 거절한다.
+rate_limit_blocked = TTLCache(maxsize=1000, ttl=1)
+
+# 경로별 (분당 한도, 카운터 그룹). 모듈 로드 시 한 번 만들어 요청마다 dict 조회 한 번으로 끝낸다.
+RATE_LIMITS = {
+    "/api/sync": (20, "sync"),
+    "/api/sync/cancel": (20, "sync"),
+    "/api/search": (90, "search"),
+    "/api/songs": (90, "search"),
+    "/api/song-details": (90, "search"),
+}
+PROXY_RATE_LIMIT = (180, "proxy")
+DEFAULT_RATE_LIMIT = (120, "api")
+
+
+def get_rate_limit(path: str) -> tuple[int, str]:
+    return RATE_LIMITS.get(path) or (PROXY_RATE_LIMIT if path.startswith("/api/v2/") else DEFAULT_RATE_LIMIT)
+
+# REDIS_URL이 있으면 카운터를 Redis에 두어 워커 간 한도를 공유한다.
+REDIS_URL = os.environ.get("REDIS_URL", "").strip()
+# INCR과 첫 요청의 EXPIRE를 한 번의 왕복에서 원자적으로 처리한다.
+RATE_LIMIT_LUA = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+redis_client = None
+rate_limit_script = None
+
+
+async def init_redis() -> None:
+    """REDIS_URL이 설정되어 있으면 Redis 연결과 rate limit 스크립트를 준비한다."""
+    global redis_client, rate_limit_script
+    if not REDIS_URL:
+        return
+    if not HAS_REDIS:
+        print("⚠️ REDIS_URL is set, but the redis package is not installed. Using in-process limits.")
+        return
+
+    client = redis_asyncio.from_url(REDIS_URL)
+    try:
+        await client.ping()
+    except Exception as e:
+        print(f"⚠️ Redis unavailable, using in-process limits: {e}")
+        await client.aclose()
+        return
+
+    redis_client = client
+    # register_script는 EVALSHA를 쓰고 NOSCRIPT면 스크립트를 다시 올린다.
+    rate_limit_script = redis_client.register_script(RATE_LIMIT_LUA)
+    print("✅ Redis connected (shared rate limits and proxy cache)")
+
+
+async def close_redis() -> None:
+    global redis_client, rate_limit_script
+    if redis_client is not None:
+        await redis_client.aclose()
+    redis_client = None
+    rate_limit_script = None
 
 
-def check_rate_limit(request: Request, limit: int = 30, path_group: str = "default"):
+async def check_rate_limit(request: Request, limit: int = 30, path_group: str = "default"):
     """IP + 경로 그룹 기반 rate limiting (분당 limit회)"""
     client_ip = get_client_ip(request)
     # IP + 경로 그룹으로 독립 카운터 운영
     cache_key = f"{client_ip}:{path_group}"
+    if cache_key in rate_limit_blocked:
+        raise HTTPException(status_code=429, detail="Too many requests")
+
+    if rate_limit_script is not None:
+        try:
+            current_count = await rate_limit_script(
+                keys=[f"ratelimit:{cache_key}"],
+                args=[RATE_LIMIT_WINDOW_SECONDS],
+            )
+        except Exception as e:
+            # Redis 장애 시에는 프로세스 로컬 카운터로 계속 보호한다.
+            logger.warning("Redis rate limit failed, using in-process limits: %s", e)
+        else:
+            if current_count > limit:
+                rate_limit_blocked[cache_key] = True
+                raise HTTPException(status_code=429, detail="Too many requests")
+            return
+
     current_count = rate_limit_cache.get(cache_key, 0)
     if current_count >= limit:
+        rate_limit_blocked[cache_key] = True
         raise HTTPException(status_code=429, detail="Too many requests")
     rate_limit_cache[cache_key] = current_count + 1
 
 
 
 # --- Sync Status (상세 정보 추가) ---
-sync_status = {
-    "isSyncing": False,
-    "lastSyncTime": None,
-    "totalChannels": len(CHANNEL_IDS),
-    "syncedChannels": 0,
-    "currentChannel": None,      # 현재 처리 중인 채널명
-    "totalVideos": 0,            # 총 다운로드한 영상 수
-    "cancelled": False           # 취소 플래그
-}
+@dataclass(slots=True)
+class SyncStatus:
+    """동기화 진행 상태. 필드명은 /api/sync/status 응답 키와 같다."""
+    isSyncing: bool = False
+    lastSyncTime: Optional[int] = None
+    totalChannels: int = len(CHANNEL_IDS)
+    syncedChannels: int = 0
+    currentChannel: Optional[str] = None   # 현재 처리 중인 채널명
+    totalVideos: int = 0                   # 총 다운로드한 영상 수
+    cancelled: bool = False                # 취소 플래그
+    channelNames: dict = field(default_factory=dict)
+
+
+sync_status = SyncStatus()
+# 동기화 루프는 이 이벤트로 취소를 감지하고, 페이지 사이 대기 중에도 바로 깨어난다.
+# reset_sync_status가 실행마다 새로 만들어 이전 이벤트 루프에 묶이지 않게 한다.
+sync_cancel_event = asyncio.Event()
 
 # --- HTTP Client (최적화) ---
 http_client: Optional[httpx.AsyncClient] = None
+HOLODEX_V2 = "https://holodex.net/api/v2/"
 VIDEO_SYNC_LIMIT = 50
 VIDEO_SYNC_MAX_RETRIES = 5
 VIDEO_SYNC_DELAY_SEC = 0.05
+VIDEO_SYNC_MAX_BACKOFF_SEC = 30
+# 여러 채널이 동시에 429를 받아도 같은 순간에 재시도하지 않도록 대기 시간을 20%까지 흔든다.
+VIDEO_SYNC_BACKOFF_JITTER = 0.2
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 초로 바꾼다."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def get_sync_backoff_seconds(retry_after: Optional[str], retry_count: int) -> float:
+    """429 응답 뒤 대기 시간. Retry-After가 있으면 그 값을 하한으로 두고, 없으면 지수 백오프를 쓴다."""
+    backoff = min(3 * (2 ** (retry_count - 1)), VIDEO_SYNC_MAX_BACKOFF_SEC)
+    retry_after = parse_retry_after(retry_after)
+    if retry_after is None:
+        return backoff * random.uniform(1 - VIDEO_SYNC_BACKOFF_JITTER, 1 + VIDEO_SYNC_BACKOFF_JITTER)
+    # 서버가 요청한 시각보다 먼저 재시도하면 다시 429를 받으므로 지터는 위로만 더한다.
+    return max(retry_after, backoff) * random.uniform(1.0, 1 + VIDEO_SYNC_BACKOFF_JITTER)
+
+
+async def wait_for_sync_cancel(delay: float) -> bool:
+    """delay초 동안 기다리되 그 사이 취소되면 True를 반환한다."""
+    try:
+        await asyncio.wait_for(sync_cancel_event.wait(), delay)
+    except asyncio.TimeoutError:
+        return False
+    return True
 
 
 def get_sync_channel_name(channel_id: str) -> str:
     """동기화 화면에 표시할 채널명을 찾는다."""
-    channel_names = sync_status.get("channelNames", {})
+    channel_names = sync_status.channelNames
     if channel_id in channel_names:
         return channel_names[channel_id]
 
-    from channels import CHANNELS
-    channel_info = next((ch for ch in CHANNELS if ch["id"] == channel_id), None)
+    channel_info = CHANNEL_BY_ID.get(channel_id)
     return channel_info["name"] if channel_info else channel_id
 
 
 def build_video_sync_url(filter_name: str, channel_id: str, offset: int) -> str:
     """Holodex 영상 동기화 URL을 만든다."""
     return (
-        "https://holodex.net/api/v2/videos"
+        f"{HOLODEX_V2}videos"
         f"?{filter_name}={channel_id}"
         f"&status=past,missing&type=stream&limit={VIDEO_SYNC_LIMIT}"
         f"&offset={offset}&sort=available_at&order=desc&include=mentions,songs"
@@ -347,7 +646,7 @@ def resolve_sync_api_key(body_api_key: Optional[str]) -> str:
 
 async def sync_video_query(channel_id: str, channel_name: str, api_key: Optional[str], full_sync: bool, filter_name: str, label: str) -> int:
     """단일 Holodex 영상 쿼리를 끝까지 동기화한다."""
-    global http_client, sync_status
+    global http_client
 
     offset = 0
     retry_count = 0
@@ -355,43 +654,46 @@ async def sync_video_query(channel_id: str, channel_name: str, api_key: Optional
     headers = {"X-APIKEY": api_key} if api_key else {}
 
     while True:
-        if sync_status.get("cancelled", False):
-            print(f"⏹️ Sync cancelled for {channel_name} ({label})")
+        if sync_cancel_event.is_set():
+            logger.info("Sync cancelled for %s (%s)", channel_name, label)
             break
 
         try:
-            sync_status["currentChannel"] = f"{channel_name} · {label}"
+            sync_status.currentChannel = f"{channel_name} · {label}"
             url = build_video_sync_url(filter_name, channel_id, offset)
             response = await http_client.get(url, headers=headers)
 
             if response.status_code == 429:
                 retry_count += 1
                 if retry_count > VIDEO_SYNC_MAX_RETRIES:
-                    print(f"❌ Max retries exceeded for {channel_name} ({label})")
+                    logger.warning("Max retries exceeded for %s (%s)", channel_name, label)
+                    break
+                backoff_seconds = get_sync_backoff_seconds(response.headers.get("Retry-After"), retry_count)
+                logger.warning(
+                    "Rate Limit (429) for %s (%s). Retry %d/%d, waiting %.1fs",
+                    channel_name, label, retry_count, VIDEO_SYNC_MAX_RETRIES, backoff_seconds
+                )
+                if await wait_for_sync_cancel(backoff_seconds):
+                    logger.info("Sync cancelled for %s (%s)", channel_name, label)
                     break
-                backoff_ms = min(3000 * (2 ** (retry_count - 1)), 30000)
-                print(f"⚠️ Rate Limit (429) for {channel_name} ({label}). Retry {retry_count}/{VIDEO_SYNC_MAX_RETRIES}, waiting {backoff_ms/1000}s...")
-                await asyncio.sleep(backoff_ms / 1000)
                 continue
 
             retry_count = 0
             if response.status_code != 200:
                 raise Exception(f"API Error: {response.status_code}")
 
-            videos = response.json()
+            videos = db.loads_json(response.content)
             if not videos:
                 break
 
-            loop = asyncio.get_event_loop()
-            new_count = await loop.run_in_executor(
-                db_executor,
-                db.insert_videos_transaction,
-                videos
-            )
+            new_count = await insert_synced_videos(videos)
 
             channel_video_count += len(videos)
-            sync_status["totalVideos"] += len(videos)
-            print(f"   {channel_name} ({label}): Fetched {len(videos)}, New: {new_count} (Total: {channel_video_count})")
+            sync_status.totalVideos += len(videos)
+            logger.debug(
+                "%s (%s): Fetched %d, New: %d (Total: %d)",
+                channel_name, label, len(videos), new_count, channel_video_count
+            )
 
             if should_stop_video_sync(filter_name, full_sync, new_count):
                 break
@@ -400,10 +702,12 @@ async def sync_video_query(channel_id: str, channel_name: str, api_key: Optional
                 break
 
             offset += VIDEO_SYNC_LIMIT
-            await asyncio.sleep(VIDEO_SYNC_DELAY_SEC)
+            if await wait_for_sync_cancel(VIDEO_SYNC_DELAY_SEC):
+                logger.info("Sync cancelled for %s (%s)", channel_name, label)
+                break
 
         except Exception as e:
-            print(f"❌ Sync error for {channel_name} ({label}): {e}")
+            logger.warning("Sync error for %s (%s): %s", channel_name, label, e)
             break
 
     return channel_video_count
@@ -412,18 +716,16 @@ async def sync_video_query(channel_id: str, channel_name: str, api_key: Optional
 async def sync_channel_videos(channel_id: str, api_key: Optional[str], full_sync: bool = False):
     """채널 업로드와 해당 채널이 멘션된 영상을 함께 동기화한다."""
     channel_name = get_sync_channel_name(channel_id)
-    print(f"🔄 Syncing videos for {channel_name} ({channel_id}) (Full Sync: {full_sync})...")
+    logger.info("Syncing videos for %s (%s) (Full Sync: %s)", channel_name, channel_id, full_sync)
 
     own_count = await sync_video_query(channel_id, channel_name, api_key, full_sync, "channel_id", "업로드")
     mentioned_count = await sync_video_query(channel_id, channel_name, api_key, full_sync, "mentioned_channel_id", "멘션")
 
-    print(f"✅ Sync complete for {channel_name} (uploads: {own_count}, mentions: {mentioned_count})")
+    logger.info("Sync complete for %s (uploads: %d, mentions: %d)", channel_name, own_count, mentioned_count)
 
 
 async def run_sync(api_key: Optional[str], full_sync: bool, channel_ids: list = None):
     """백그라운드 동기화 실행 (개선된 진행률)"""
-    global sync_status
-    
     # 채널 목록이 없으면 기본값 사용
     if channel_ids is None:
         channel_ids = CHANNEL_IDS
@@ -431,14 +733,17 @@ async def run_sync(api_key: Optional[str], full_sync: bool, channel_ids: list =
     async def sync_and_count(channel_id):
         """채널 동기화 후 카운터 증가"""
         try:
+            # 취소 요청 뒤에는 세마포어 대기 중이던 채널을 시작하지 않는다.
+            if sync_cancel_event.is_set():
+                return
             await sync_channel_videos(channel_id, api_key, full_sync)
         except Exception as e:
-            print(f"❌ Failed for {channel_id}: {e}")
+            logger.error("Sync failed for %s: %s", channel_id, e)
         finally:
-            sync_status["syncedChannels"] += 1
+            sync_status.syncedChannels += 1
     
     try:
-        print(f"🚀 Starting sync for {len(channel_ids)} channels...")
+        logger.info("Starting sync for %d channels", len(channel_ids))
 
         semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
 
@@ -446,30 +751,34 @@ async def run_sync(api_key: Optional[str], full_sync: bool, channel_ids: list =
             async with semaphore:
                 await sync_and_count(channel_id)
 
-        tasks = [bounded_sync(ch) for ch in channel_ids]
-        await asyncio.gather(*tasks, return_exceptions=True)
-        
-        if sync_status.get("cancelled"):
-            print("⏹️ Sync was cancelled by user")
+        # TaskGroup은 run_sync 자체가 취소되면 남은 채널 작업도 함께 정리한다.
+        async with asyncio.TaskGroup() as task_group:
+            for channel_id in channel_ids:
+                task_group.create_task(bounded_sync(channel_id))
+
+        if sync_cancel_event.is_set():
+            logger.info("Sync was cancelled by user")
         else:
-            print(f"🏁 All channels synced! Total videos: {sync_status['totalVideos']}")
-    except Exception as e:
-        print(f"Global sync error: {e}")
+            logger.info("All channels synced. Total videos: %d", sync_status.totalVideos)
+    except Exception:
+        logger.exception("Global sync error")
     finally:
-        sync_status["isSyncing"] = False
-        sync_status["cancelled"] = False
-        sync_status["lastSyncTime"] = int(time.time() * 1000)
+        sync_status.isSyncing = False
+        sync_status.cancelled = False
+        sync_status.lastSyncTime = int(time.time() * 1000)
 
 
 def reset_sync_status(channel_ids: list[str], channel_names: dict | None = None) -> None:
     """동기화 상태를 새 작업 기준으로 초기화한다."""
-    sync_status["isSyncing"] = True
-    sync_status["syncedChannels"] = 0
-    sync_status["totalVideos"] = 0
-    sync_status["currentChannel"] = None
-    sync_status["cancelled"] = False
-    sync_status["totalChannels"] = len(channel_ids)
-    sync_status["channelNames"] = channel_names or {}
+    global sync_cancel_event
+    sync_cancel_event = asyncio.Event()
+    sync_status.isSyncing = True
+    sync_status.syncedChannels = 0
+    sync_status.totalVideos = 0
+    sync_status.currentChannel = None
+    sync_status.cancelled = False
+    sync_status.totalChannels = len(channel_ids)
+    sync_status.channelNames = channel_names or {}
 
 
 async def auto_incremental_sync_loop() -> None:
@@ -478,12 +787,12 @@ async def auto_incremental_sync_loop() -> None:
     while True:
         api_key = os.environ.get("HOLODEX_API_KEY", "").strip()
         if not api_key:
-            print("AUTO_SYNC_ENABLED is true, but HOLODEX_API_KEY is missing. Skipping auto sync.")
-        elif sync_status.get("isSyncing"):
-            print("Auto sync skipped because another sync is already running.")
+            logger.warning("AUTO_SYNC_ENABLED is true, but HOLODEX_API_KEY is missing. Skipping auto sync.")
+        elif sync_status.isSyncing:
+            logger.info("Auto sync skipped because another sync is already running.")
         else:
             channel_ids = list(CHANNEL_IDS)
-            print(f"Starting scheduled incremental sync for {len(channel_ids)} channels.")
+            logger.info("Starting scheduled incremental sync for %d channels.", len(channel_ids))
             reset_sync_status(channel_ids)
             await run_sync(api_key, full_sync=False, channel_ids=channel_ids)
 
@@ -493,16 +802,24 @@ async def auto_incremental_sync_loop() -> None:
 # --- Lifespan (안정성 개선) ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global http_client
+    global http_client, video_write_queue
+    start_log_listener()
     if IS_PRODUCTION and not has_strong_admin_token():
         print("⚠️ WARNING: ADMIN_TOKEN is missing or weak. Admin endpoints will reject requests.")
+    # 스키마/인덱스 준비는 import 시점이 아니라 앱 기동 시 한 번만 한다.
+    # 첫 기동의 FTS 백필/통계 재구성이 이벤트 루프를 막지 않도록 DB 스레드풀에서 돌린다.
+    await run_db(db.init_db)
     # 타임아웃 증가 및 안정성 향상
+    # 동기화는 여러 채널을 동시에 요청하므로 keep-alive 풀을 최대 연결 수만큼 유지해 TLS 재협상을 피한다.
     http_client = httpx.AsyncClient(
         timeout=httpx.Timeout(30.0, connect=10.0),  # 타임아웃 증가
-        limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
-        http2=False  # HTTP/1.1 사용 (호환성)
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=100, keepalive_expiry=60),
+        http2=HAS_HTTP2  # h2가 없으면 HTTP/1.1로 동작
     )
-    print("✅ HTTP client initialized (optimized)")
+    print(f"✅ HTTP client initialized (optimized, {'HTTP/2' if HAS_HTTP2 else 'HTTP/1.1'})")
+    await init_redis()
+    video_write_queue = asyncio.Queue()
+    video_writer_task = asyncio.create_task(video_writer_loop(video_write_queue))
     auto_sync_task = None
     if AUTO_SYNC_ENABLED:
         auto_sync_task = asyncio.create_task(auto_incremental_sync_loop())
@@ -516,9 +833,19 @@ async def lifespan(app: FastAPI):
                 await auto_sync_task
             except asyncio.CancelledError:
                 pass
+    write_queue, video_write_queue = video_write_queue, None
+    video_writer_task.cancel()
+    try:
+        await video_writer_task
+    except asyncio.CancelledError:
+        pass
+    while not write_queue.empty():
+        write_queue.get_nowait()[1].cancel()
     await http_client.aclose()
+    await close_redis()
     db_executor.shutdown(wait=False)
     print("✅ HTTP client and DB executor closed")
+    stop_log_listener()
 
 
 # --- FastAPI App (최적화: ORJSONResponse 사용) ---
@@ -554,36 +881,19 @@ async def edge_safety_middleware(request: Request, call_next):
         if len(str(request.url.query).encode("utf-8")) > MAX_QUERY_STRING_BYTES:
             return JSONResponse({"error": "Query string too large"}, status_code=413)
 
-        limit = 120
-        path_group = "api"
-        if path in {"/api/sync", "/api/sync/cancel"}:
-            limit = 20
-            path_group = "sync"
-        elif path in {"/api/search", "/api/songs", "/api/song-details"}:
-            limit = 90
-            path_group = "search"
-        elif path.startswith("/api/v2/"):
-            limit = 180
-            path_group = "proxy"
-
+        limit, path_group = get_rate_limit(path)
         try:
-            check_rate_limit(request, limit=limit, path_group=path_group)
+            await check_rate_limit(request, limit=limit, path_group=path_group)
         except HTTPException as exc:
             return JSONResponse({"error": exc.detail}, status_code=exc.status_code)
 
     response = await call_next(request)
 
-    # 정적 파일 캐시 정책 (Cloudflare Edge + 브라우저)
-    # s-maxage = CDN 캐시, max-age = 브라우저 캐시
-    if path == "/" or path.endswith(".html"):
-        # HTML: 짧은 캐시 (배포 후 빠른 반영)
-        response.headers["Cache-Control"] = "public, max-age=60, s-maxage=300"
-    elif path.endswith(".js") or path.endswith(".css"):
-        # JS/CSS는 파일명 해시가 없어서 CDN에도 보관하지 않는다.
-        response.headers["Cache-Control"] = "no-store, max-age=0"
-    elif any(path.endswith(ext) for ext in (".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp")):
-        # 이미지: 장기 캐시
-        response.headers["Cache-Control"] = "public, max-age=86400, s-maxage=604800"
+    # API 응답은 정적 파일 캐시 정책 대상이 아니므로 확장자 조회를 건너뛴다.
+    if not path.startswith("/api/"):
+        cache_control = get_static_cache_control(path)
+        if cache_control:
+            response.headers["Cache-Control"] = cache_control
 
     response.headers.setdefault("X-Content-Type-Options", "nosniff")
     response.headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
@@ -596,9 +906,7 @@ async def edge_safety_middleware(request: Request, call_next):
 @app.post("/api/sync")
 async def trigger_sync(request: Request, background_tasks: BackgroundTasks):
     """동기화 트리거 (인증 필요)"""
-    global sync_status
-    
-    if sync_status["isSyncing"]:
+    if sync_status.isSyncing:
         return JSONResponse({"message": "Sync already in progress"}, status_code=409)
 
     verify_admin(request)
@@ -615,7 +923,7 @@ async def trigger_sync(request: Request, background_tasks: BackgroundTasks):
     full_sync = body.get("fullSync", False) is True
     channel_ids, channel_names = normalize_sync_channels(body.get("channels"))
     
-    print(f"🚀 Starting background sync for {len(channel_ids)} channels (Full: {full_sync})...")
+    logger.info("Starting background sync for %d channels (Full: %s)", len(channel_ids), full_sync)
     
     reset_sync_status(channel_ids, channel_names)
     
@@ -627,20 +935,19 @@ async def trigger_sync(request: Request, background_tasks: BackgroundTasks):
 @app.get("/api/sync/status")
 async def get_sync_status():
     """동기화 상태 조회"""
-    return {**sync_status, "dbSeed": db.get_seed_status()}
+    return {**asdict(sync_status), "dbSeed": db.get_seed_status()}
 
 
 @app.post("/api/sync/cancel")
 async def cancel_sync(request: Request):
     """동기화 취소 (인증 필요)"""
     verify_admin(request)
-    global sync_status
-    
-    if not sync_status["isSyncing"]:
+    if not sync_status.isSyncing:
         return JSONResponse({"message": "No sync in progress"}, status_code=400)
     
-    sync_status["cancelled"] = True
-    print("⏹️ Sync cancel requested by user")
+    sync_status.cancelled = True
+    sync_cancel_event.set()
+    logger.info("Sync cancel requested by user")
     
     return {"message": "Sync cancel requested"}
 
@@ -668,20 +975,16 @@ async def search(
     years_list = parse_years_filter(filter_years)
     months_list = parse_months_filter(filter_months)
     
-    print(f'🔍 DB Search: "{q}" in {channel_id}, collab={collab}, mode={collab_mode}, hideUnarchived={hide_flag}, dates={dates_list}, years={years_list}, months={months_list}, videoType={video_type}')
+    logger.debug(
+        'DB Search: "%s" in %s, collab=%s, mode=%s, hideUnarchived=%s, dates=%s, years=%s, months=%s, videoType=%s',
+        q, channel_id, collab, collab_mode, hide_flag, dates_list, years_list, months_list, video_type
+    )
     
     try:
-        loop = asyncio.get_event_loop()
-        
-        # 병렬로 검색 및 카운트 실행
-        results_future = loop.run_in_executor(
-            db_executor, db.search_videos, q, channel_id, limit, offset, collab, collab_mode, hide_flag, dates_list, years_list, months_list, video_type
+        # 한 쿼리에서 페이지와 전체 개수를 함께 계산 (WHERE 절 평가 1회)
+        results, total = await run_db(
+            db.search_videos_with_total, q, channel_id, limit, offset, collab, collab_mode, hide_flag, dates_list, years_list, months_list, video_type
         )
-        count_future = loop.run_in_executor(
-            db_executor, db.count_videos, q, channel_id, collab, collab_mode, hide_flag, dates_list, years_list, months_list, video_type
-        )
-        
-        results, total = await asyncio.gather(results_future, count_future)
         
         return {
             "items": results,
@@ -689,8 +992,8 @@ async def search(
         }
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Search failed: {e}")
+    except Exception:
+        logger.exception("Search failed")
         return JSONResponse({"error": "Search failed"}, status_code=500)
 
 
@@ -710,12 +1013,11 @@ async def search_songs(
     channel_id = require_channel_id(channel_id)
     collab = parse_channel_id_list(collab, "collab")
     try:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            db_executor, db.get_songs_response, q, channel_id, limit, offset, sort, category, collab, collab_mode
+        return await run_db(
+            db.get_songs_response, q, channel_id, limit, offset, sort, category, collab, collab_mode
         )
-    except Exception as e:
-        print(f"Song search failed: {e}")
+    except Exception:
+        logger.exception("Song search failed")
         return JSONResponse({"error": "Song search failed"}, status_code=500)
 
 
@@ -735,12 +1037,11 @@ async def song_details(
         raise HTTPException(status_code=422, detail="title or itunesid is required")
 
     try:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            db_executor, db.get_song_details_response, title, artist, itunesid, limit, offset
+        return await run_db(
+            db.get_song_details_response, title, artist, itunesid, limit, offset
         )
-    except Exception as e:
-        print(f"Song detail failed: {e}")
+    except Exception:
+        logger.exception("Song detail failed")
         return JSONResponse({"error": "Song detail failed"}, status_code=500)
 
 
@@ -748,15 +1049,14 @@ async def song_details(
 async def get_channel_index():
     """로컬 DB에 저장된 채널 인덱스"""
     try:
-        loop = asyncio.get_event_loop()
-        items = await loop.run_in_executor(db_executor, db.get_channel_index)
+        items = await run_db(db.get_channel_index)
         allowed_items = [
             item for item in items
             if is_allowed_channel_id(item.get("id") if isinstance(item, dict) else None)
         ]
         return {"items": allowed_items}
-    except Exception as e:
-        print(f"Channel index failed: {e}")
+    except Exception:
+        logger.exception("Channel index failed")
         return JSONResponse({"error": "Channel index failed"}, status_code=500)
 
 
@@ -767,11 +1067,10 @@ async def get_yearly_stats(channel_id: str):
     """년도별 방송 통계"""
     channel_id = require_channel_id(channel_id)
     try:
-        loop = asyncio.get_event_loop()
-        stats = await loop.run_in_executor(db_executor, db.get_yearly_stats, channel_id)
+        stats = await run_db(db.get_yearly_stats, channel_id)
         return {"items": stats}
-    except Exception as e:
-        print(f"Yearly stats failed: {e}")
+    except Exception:
+        logger.exception("Yearly stats failed")
         return JSONResponse({"error": "Stats request failed"}, status_code=500)
 
 
@@ -781,11 +1080,10 @@ async def get_monthly_stats(channel_id: str, year: str):
     channel_id = require_channel_id(channel_id)
     year = validate_year(year)
     try:
-        loop = asyncio.get_event_loop()
-        stats = await loop.run_in_executor(db_executor, db.get_monthly_stats, channel_id, year)
+        stats = await run_db(db.get_monthly_stats, channel_id, year)
         return {"items": stats}
-    except Exception as e:
-        print(f"Monthly stats failed: {e}")
+    except Exception:
+        logger.exception("Monthly stats failed")
         return JSONResponse({"error": "Stats request failed"}, status_code=500)
 
 
@@ -794,11 +1092,10 @@ async def get_yearly_membership_stats(channel_id: str):
     """년도별 멤버십 통계"""
     channel_id = require_channel_id(channel_id)
     try:
-        loop = asyncio.get_event_loop()
-        stats = await loop.run_in_executor(db_executor, db.get_yearly_membership_stats, channel_id)
+        stats = await run_db(db.get_yearly_membership_stats, channel_id)
         return {"items": stats}
-    except Exception as e:
-        print(f"Yearly membership stats failed: {e}")
+    except Exception:
+        logger.exception("Yearly membership stats failed")
         return JSONResponse({"error": "Stats request failed"}, status_code=500)
 
 
@@ -808,11 +1105,10 @@ async def get_membership_stats(channel_id: str, year: str):
     channel_id = require_channel_id(channel_id)
     year = validate_year(year)
     try:
-        loop = asyncio.get_event_loop()
-        stats = await loop.run_in_executor(db_executor, db.get_monthly_membership_stats, channel_id, year)
+        stats = await run_db(db.get_monthly_membership_stats, channel_id, year)
         return {"items": stats}
-    except Exception as e:
-        print(f"Membership stats failed: {e}")
+    except Exception:
+        logger.exception("Membership stats failed")
         return JSONResponse({"error": "Stats request failed"}, status_code=500)
 
 
@@ -821,11 +1117,10 @@ async def get_collab_stats(channel_id: str):
     """콜라보 멤버별 횟수"""
     channel_id = require_channel_id(channel_id)
     try:
-        loop = asyncio.get_event_loop()
-        stats = await loop.run_in_executor(db_executor, db.get_collab_stats, channel_id)
+        stats = await run_db(db.get_collab_stats, channel_id)
         return {"items": stats}
-    except Exception as e:
-        print(f"Collab stats failed: {e}")
+    except Exception:
+        logger.exception("Collab stats failed")
         return JSONResponse({"error": "Stats request failed"}, status_code=500)
 
 
@@ -835,11 +1130,10 @@ async def get_yearly_collab_stats(channel_id: str, year: str):
     channel_id = require_channel_id(channel_id)
     year = validate_year(year)
     try:
-        loop = asyncio.get_event_loop()
-        stats = await loop.run_in_executor(db_executor, db.get_yearly_collab_stats, channel_id, year)
+        stats = await run_db(db.get_yearly_collab_stats, channel_id, year)
         return {"items": stats}
-    except Exception as e:
-        print(f"Yearly collab stats failed: {e}")
+    except Exception:
+        logger.exception("Yearly collab stats failed")
         return JSONResponse({"error": "Stats request failed"}, status_code=500)
 
 
@@ -848,11 +1142,10 @@ async def get_topic_stats(channel_id: str):
     """전체 컨텐츠/게임 통계"""
     channel_id = require_channel_id(channel_id)
     try:
-        loop = asyncio.get_event_loop()
-        stats = await loop.run_in_executor(db_executor, db.get_topic_stats, channel_id)
+        stats = await run_db(db.get_topic_stats, channel_id)
         return {"items": stats}
-    except Exception as e:
-        print(f"Topic stats failed: {e}")
+    except Exception:
+        logger.exception("Topic stats failed")
         return JSONResponse({"error": "Stats request failed"}, status_code=500)
 
 
@@ -862,15 +1155,66 @@ async def get_yearly_topic_stats(channel_id: str, year: str):
     channel_id = require_channel_id(channel_id)
     year = validate_year(year)
     try:
-        loop = asyncio.get_event_loop()
-        stats = await loop.run_in_executor(db_executor, db.get_yearly_topic_stats, channel_id, year)
+        stats = await run_db(db.get_yearly_topic_stats, channel_id, year)
         return {"items": stats}
-    except Exception as e:
-        print(f"Yearly topic stats failed: {e}")
+    except Exception:
+        logger.exception("Yearly topic stats failed")
         return JSONResponse({"error": "Stats request failed"}, status_code=500)
 
 
 # --- Holodex API Proxy (최적화) ---
+def get_cache_duration(path: str) -> int:
+    """프록시 경로별 캐시 유지 시간(초)"""
+    return PROXY_CACHE_TTL_SECONDS.get(path, PROXY_CACHE_DEFAULT_TTL_SECONDS)
+
+
+def encode_shared_proxy_entry(status_code: int, content_type: str, body: bytes) -> bytes:
+    """Redis에 넣을 프록시 응답. pickle 없이 status, content-type, body를 줄바꿈으로 잇는다."""
+    return f"{status_code}\n{content_type}\n".encode("utf-8") + body
+
+
+def decode_shared_proxy_entry(raw: bytes) -> tuple:
+    status_code, content_type, body = raw.split(b"\n", 2)
+    return int(status_code), content_type.decode("utf-8"), body
+
+
+async def get_shared_proxy_cache(cache_key: str) -> Optional[tuple]:
+    """다른 워커가 채운 프록시 캐시를 Redis에서 찾는다.
+
+    (status, content_type, body, 남은 ttl초)를 돌려준다. 로컬 캐시에는 남은 ttl만큼만 두어
+    Redis에서 곧 만료될 응답이 로컬에서 다시 전체 ttl 동안 살아남지 않게 한다.
+    """
+    if redis_client is None:
+        return None
+    try:
+        redis_key = f"proxy:{cache_key}"
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(redis_key)
+        pipe.pttl(redis_key)
+        raw, remaining_ms = await pipe.execute()
+        if not raw:
+            return None
+        # PTTL은 키가 없으면 -2, 만료가 없으면 -1이다. 둘 다 로컬에는 다시 담지 않는다.
+        return (*decode_shared_proxy_entry(raw), max(0, remaining_ms) / 1000)
+    except Exception as e:
+        logger.warning("Redis proxy cache read failed: %s", e)
+        return None
+
+
+async def set_shared_proxy_cache(cache_key: str, proxied: tuple, ttl: int) -> None:
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(f"proxy:{cache_key}", encode_shared_proxy_entry(*proxied), ex=ttl)
+    except Exception as e:
+        logger.warning("Redis proxy cache write failed: %s", e)
+
+
+def build_proxy_response(status_code: int, content_type: str, body: bytes) -> Response:
+    """Holodex 응답 바이트를 그대로 전달하는 응답을 만든다."""
+    return Response(content=body, media_type=content_type, status_code=status_code)
+
+
 @app.api_route("/api/v2/{path:path}", methods=["GET", "POST"])
 async def proxy_holodex(path: str, request: Request):
     """Holodex API 프록시"""
@@ -885,20 +1229,31 @@ async def proxy_holodex(path: str, request: Request):
         proxy_api_key = os.environ.get("HOLODEX_API_KEY", "").strip()
     
     # 캐시 키 생성
-    cache_key = f"{request.method}:{request.url.path}?{request.url.query}"
+    query = request.url.query
+    cache_key = f"{request.method}:{request.url.path}?{query}"
     
     # 사용자 API 키가 붙은 응답은 다른 사용자에게 재사용하지 않는다.
     can_use_proxy_cache = request.method == "GET" and not forwarded_key
 
-    # GET 요청 캐시 확인
-    if can_use_proxy_cache and cache_key in cache:
-        print(f"⚡ Serving cached: {path}")
-        return JSONResponse(cache[cache_key])
+    # GET 요청 캐시 확인: 프로세스 캐시 → Redis 공유 캐시 (원본 바이트를 그대로 돌려준다)
+    cache_ttl = get_cache_duration(path)
+    if can_use_proxy_cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Serving cached: %s", path)
+            return build_proxy_response(*cached[:3])
+
+        shared = await get_shared_proxy_cache(cache_key)
+        if shared is not None:
+            if shared[3] > 0:
+                cache[cache_key] = shared
+            logger.debug("Serving shared cache: %s", path)
+            return build_proxy_response(*shared[:3])
     
     # 프록시 요청
-    target_url = f"https://holodex.net/api/v2/{path}"
-    if request.url.query:
-        target_url += f"?{request.url.query}"
+    target_url = HOLODEX_V2 + path
+    if query:
+        target_url += "?" + query
     
     # 라이브/예정은 일반 화면이라 서버 환경변수 키를 사용할 수 있다.
     headers = {}
@@ -921,43 +1276,69 @@ async def proxy_holodex(path: str, request: Request):
                 raise HTTPException(status_code=413, detail="Request body too large")
             response = await http_client.post(target_url, headers=headers, content=body)
         
-        # 응답 내용이 비어있으면 빈 객체 반환
-        if not response.content or len(response.content) == 0:
-            return JSONResponse([], status_code=response.status_code)
-        
-        # JSON 파싱 시도
-        try:
-            data = response.json()
-        except Exception:
-            # JSON 파싱 실패 시 빈 배열 반환
-            return JSONResponse([], status_code=response.status_code)
-        
+        # 본문은 JSON 파싱/재직렬화 없이 바이트 그대로 전달한다.
+        proxied = (
+            response.status_code,
+            response.headers.get("content-type", "application/json"),
+            response.content,
+        )
+
         # 성공 시 캐시 저장
         if response.status_code == 200 and can_use_proxy_cache:
-            cache[cache_key] = data
-        
-        return JSONResponse(data, status_code=response.status_code)
+            cache[cache_key] = (*proxied, cache_ttl)
+            await set_shared_proxy_cache(cache_key, proxied, cache_ttl)
+
+        return build_proxy_response(*proxied)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Proxy error: {e}")
+        logger.error("Proxy error: %s", e)
         return JSONResponse({"error": "Proxy request failed"}, status_code=500)
 
 
 # --- Channel Image Proxy (Holodex) ---
+CHANNEL_IMAGE_CACHE_CONTROL = "public, max-age=604800"  # 7일 캐시, 만료 후에는 ETag로 재검증
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """If-None-Match/If-Modified-Since 조건이 현재 파일과 같으면 True."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+    try:
+        return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+def build_channel_image_response(request: Request, cache_path: str, media_type: str = "image/png") -> Response:
+    """디스크에 캐시된 채널 이미지를 ETag/Last-Modified와 함께 돌려주고, 변경이 없으면 304로 응답한다."""
+    stat = os.stat(cache_path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "Cache-Control": CHANNEL_IMAGE_CACHE_CONTROL,
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+    }
+    if is_not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(cache_path, media_type=media_type, headers=headers, stat_result=stat)
+
+
 @app.get("/api/statics/channelImg/{channel_id}")
-async def get_channel_image(channel_id: str):
+async def get_channel_image(channel_id: str, request: Request):
     """채널 아이콘 이미지 프록시 (CORS 우회)"""
     if not CHANNEL_ID_PATTERN.fullmatch(channel_id):
         raise HTTPException(status_code=400, detail="Invalid channel id")
 
     cache_path = os.path.join(CHANNEL_IMAGE_CACHE_DIR, f"{channel_id}.png")
     if os.path.exists(cache_path):
-        return FileResponse(
-            cache_path,
-            media_type="image/png",
-            headers={"Cache-Control": "public, max-age=604800"}
-        )
+        return build_channel_image_response(request, cache_path)
 
     try:
         url = f"https://holodex.net/statics/channelImg/{channel_id}.png"
@@ -971,30 +1352,24 @@ async def get_channel_image(channel_id: str):
                 image_file.write(response.content)
             os.replace(temp_path, cache_path)
 
-            # 이미지 직접 반환
-            from fastapi.responses import Response
-            return Response(
-                content=response.content,
-                media_type=content_type,
-                headers={"Cache-Control": "public, max-age=604800"}  # 7일 캐시
-            )
+            # 저장한 파일 기준 ETag를 내려 다음 요청부터 304로 재검증할 수 있게 한다.
+            return build_channel_image_response(request, cache_path, content_type)
         else:
             # 404 등 에러 시 기본 플레이스홀더 반환
             return JSONResponse({"error": "Image not found"}, status_code=404)
-    except Exception as e:
-        print(f"Channel image proxy error: {e}")
+    except Exception:
+        logger.exception("Channel image proxy error")
         return JSONResponse({"error": "Channel image request failed"}, status_code=500)
 
 
-# --- Static Files (로컬/배포 공통: public/) ---
-
-@app.get("/")
-async def serve_index():
-    return FileResponse(f"{STATIC_DIR}/index.html")
-
+# --- Static Files (로컬/배포 공통: public/, SERVE_STATIC=false면 앞단 서버가 담당) ---
+if SERVE_STATIC:
+    @app.get("/")
+    async def serve_index():
+        return FileResponse(f"{STATIC_DIR}/index.html")
 
-# 정적 파일 마운트 (마지막에 배치)
-app.mount("/", StaticFiles(directory=STATIC_DIR), name="static")
+    # 정적 파일 마운트 (마지막에 배치)
+    app.mount("/", StaticFiles(directory=STATIC_DIR), name="static")
 
 
 # --- Main ---
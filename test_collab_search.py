@@ -30,6 +30,7 @@ class CollabSearchTest(unittest.TestCase):
         database.init_db()
 
     def tearDown(self):
+        database.close_thread_connection()
         database.DB_PATH = self.old_db_path
         os.remove(self.temp_db_path)
 
@@ -1,5 +1,6 @@
 import asyncio
 import os
+import tempfile
 import unittest
 from types import SimpleNamespace
 from urllib.parse import parse_qs, urlparse
@@ -32,10 +33,45 @@ class VideoSyncLogicTest(unittest.TestCase):
         self.assertEqual(["desc"], params["order"])
         self.assertEqual(["mentions,songs"], params["include"])
 
+    def test_backoff_uses_retry_after_as_floor_and_jitters_fallback(self):
+        self.assertEqual(5.0, server.parse_retry_after("5"))
+        self.assertEqual(0.0, server.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"))
+        self.assertIsNone(server.parse_retry_after("soon"))
+
+        for _ in range(20):
+            self.assertTrue(5.0 <= server.get_sync_backoff_seconds("5", 1) <= 6.0)
+            self.assertTrue(12.0 <= server.get_sync_backoff_seconds("5", 3) <= 14.4)
+            self.assertTrue(9.6 <= server.get_sync_backoff_seconds(None, 3) <= 14.4)
+            self.assertTrue(24.0 <= server.get_sync_backoff_seconds(None, 10) <= 36.0)
+            self.assertTrue(600.0 <= server.get_sync_backoff_seconds("600", 1) <= 720.0)
+
+    def test_sync_channel_name_prefers_request_names_then_channel_table(self):
+        old_names = server.sync_status.channelNames
+        known = server.CHANNEL_IDS[0]
+        server.sync_status.channelNames = {"custom": "Custom Name"}
+        try:
+            self.assertEqual("Custom Name", server.get_sync_channel_name("custom"))
+            self.assertEqual(server.CHANNEL_BY_ID[known]["name"], server.get_sync_channel_name(known))
+            self.assertEqual("unknown-id", server.get_sync_channel_name("unknown-id"))
+        finally:
+            server.sync_status.channelNames = old_names
+
+    def test_limited_json_body_is_decoded_or_rejected(self):
+        def make_request(body):
+            async def read_body():
+                return body
+            return SimpleNamespace(headers={}, body=read_body)
+
+        self.assertEqual({"full": True}, asyncio.run(server.read_limited_json(make_request(b'{"full": true}'), 64)))
+        with self.assertRaises(server.HTTPException) as ctx:
+            asyncio.run(server.read_limited_json(make_request(b"{broken"), 64))
+        self.assertEqual(400, ctx.exception.status_code)
+
     def test_live_proxy_uses_server_api_key_without_user_key(self):
         class FakeResponse:
             status_code = 200
             content = b"[]"
+            headers = {"content-type": "application/json"}
 
             def json(self):
                 return []
@@ -73,6 +109,289 @@ class VideoSyncLogicTest(unittest.TestCase):
         self.assertEqual(200, response.status_code)
         self.assertEqual("server-key", fake_client.calls[0]["headers"]["X-APIKEY"])
 
+    def test_proxy_cache_hit_returns_upstream_bytes_without_refetch(self):
+        class FakeResponse:
+            status_code = 200
+            content = b'[{"id": "v1", "title": "\xed\x99\x80\xeb\xa1\x9c"}]'
+            headers = {"content-type": "application/json; charset=utf-8"}
+
+        class FakeHttpClient:
+            def __init__(self):
+                self.calls = 0
+
+            async def get(self, url, headers=None):
+                self.calls += 1
+                return FakeResponse()
+
+        old_client = server.http_client
+        fake_client = FakeHttpClient()
+        server.http_client = fake_client
+        server.cache.clear()
+        try:
+            request = SimpleNamespace(
+                method="GET",
+                url=SimpleNamespace(path="/api/v2/videos", query="channel_id=test-channel"),
+                headers={}
+            )
+            first = asyncio.run(server.proxy_holodex("videos", request))
+            second = asyncio.run(server.proxy_holodex("videos", request))
+        finally:
+            server.http_client = old_client
+            server.cache.clear()
+
+        self.assertEqual(1, fake_client.calls)
+        self.assertEqual(FakeResponse.content, first.body)
+        self.assertEqual(FakeResponse.content, second.body)
+        self.assertEqual("application/json; charset=utf-8", second.media_type)
+
+    def test_proxy_serves_shared_cache_entry_from_another_worker(self):
+        class FakePipeline:
+            def __init__(self, redis):
+                self.redis = redis
+                self.commands = []
+
+            def get(self, key):
+                self.commands.append(self.redis.store.get(key))
+
+            def pttl(self, key):
+                self.commands.append(self.redis.ttl_ms.get(key, -2))
+
+            async def execute(self):
+                return self.commands
+
+        class FakeRedis:
+            def __init__(self):
+                self.store = {}
+                self.ttl_ms = {}
+
+            def pipeline(self, transaction=True):
+                return FakePipeline(self)
+
+            async def set(self, key, value, ex=None):
+                self.store[key] = value
+
+        class FailingHttpClient:
+            async def get(self, url, headers=None):
+                raise AssertionError("upstream should not be called")
+
+        fake_redis = FakeRedis()
+        cache_key = "GET:/api/v2/videos?channel_id=test-channel"
+        fake_redis.store[f"proxy:{cache_key}"] = server.encode_shared_proxy_entry(200, "application/json", b'[{"id":"v1"}]')
+        fake_redis.ttl_ms[f"proxy:{cache_key}"] = 5000
+
+        old_client, old_redis = server.http_client, server.redis_client
+        server.http_client = FailingHttpClient()
+        server.redis_client = fake_redis
+        server.cache.clear()
+        try:
+            request = SimpleNamespace(
+                method="GET",
+                url=SimpleNamespace(path="/api/v2/videos", query="channel_id=test-channel"),
+                headers={}
+            )
+            response = asyncio.run(server.proxy_holodex("videos", request))
+            local_entry = server.cache.get(cache_key)
+
+            server.cache.clear()
+            fake_redis.ttl_ms[f"proxy:{cache_key}"] = -1
+            asyncio.run(server.proxy_holodex("videos", request))
+            untimed_entry = server.cache.get(cache_key)
+        finally:
+            server.http_client, server.redis_client = old_client, old_redis
+            server.cache.clear()
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(b'[{"id":"v1"}]', response.body)
+        # 로컬 캐시는 Redis에 남은 5초만큼만 유지하고, 전체 videos ttl(120초)로 늘리지 않는다.
+        self.assertEqual(5.0, local_entry[3])
+        self.assertIsNone(untimed_entry)
+
+
+class ChannelImageCacheTest(unittest.TestCase):
+    def setUp(self):
+        handle = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
+        handle.write(b"png-bytes")
+        handle.close()
+        self.image_path = handle.name
+
+    def tearDown(self):
+        os.remove(self.image_path)
+
+    def test_matching_etag_or_date_returns_not_modified(self):
+        first = server.build_channel_image_response(SimpleNamespace(headers={}), self.image_path)
+        etag = first.headers["etag"]
+        last_modified = first.headers["last-modified"]
+
+        self.assertEqual(200, first.status_code)
+        self.assertEqual(server.CHANNEL_IMAGE_CACHE_CONTROL, first.headers["cache-control"])
+        self.assertEqual(304, server.build_channel_image_response(SimpleNamespace(headers={"if-none-match": etag}), self.image_path).status_code)
+        self.assertEqual(304, server.build_channel_image_response(SimpleNamespace(headers={"if-modified-since": last_modified}), self.image_path).status_code)
+        self.assertEqual(200, server.build_channel_image_response(SimpleNamespace(headers={"if-none-match": '"stale"'}), self.image_path).status_code)
+
+
+class RunSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.old_status = server.sync_status
+        server.sync_status = server.SyncStatus()
+        self.old_sync_channel_videos = server.sync_channel_videos
+
+    def tearDown(self):
+        server.sync_status = self.old_status
+        server.sync_channel_videos = self.old_sync_channel_videos
+
+    def test_cancel_skips_channels_still_waiting_for_a_slot(self):
+        started = []
+
+        async def fake_sync(channel_id, api_key, full_sync=False):
+            started.append(channel_id)
+            await asyncio.sleep(0)
+            server.sync_cancel_event.set()
+
+        server.sync_channel_videos = fake_sync
+        channel_ids = [f"channel-{index}" for index in range(server.SYNC_CONCURRENCY + 2)]
+        server.reset_sync_status(channel_ids)
+
+        asyncio.run(server.run_sync("key", False, channel_ids))
+
+        self.assertEqual(server.SYNC_CONCURRENCY, len(started))
+        self.assertEqual(len(channel_ids), server.sync_status.syncedChannels)
+        self.assertFalse(server.sync_status.isSyncing)
+
+    def test_status_endpoint_reports_dataclass_fields(self):
+        server.reset_sync_status(["channel"], {"channel": "Channel"})
+
+        status = asyncio.run(server.get_sync_status())
+
+        self.assertTrue(status["isSyncing"])
+        self.assertEqual(1, status["totalChannels"])
+        self.assertEqual({"channel": "Channel"}, status["channelNames"])
+        self.assertIn("dbSeed", status)
+
+    def test_cancel_interrupts_delay_between_pages(self):
+        async def scenario():
+            server.reset_sync_status(["channel"])
+            asyncio.get_running_loop().call_later(0.01, server.sync_cancel_event.set)
+            return await server.wait_for_sync_cancel(30)
+
+        self.assertTrue(asyncio.run(scenario()))
+        server.reset_sync_status(["channel"])
+        self.assertFalse(asyncio.run(server.wait_for_sync_cancel(0)))
+
+
+class VideoWriteQueueTest(unittest.TestCase):
+    def test_writer_commits_queued_pages_together(self):
+        calls = []
+        old_insert = server.db.insert_video_batches
+
+        def fake_insert_video_batches(batches):
+            calls.append([len(videos) for videos in batches])
+            return [len(videos) for videos in batches]
+
+        async def run():
+            queue = asyncio.Queue()
+            loop = asyncio.get_running_loop()
+            futures = [loop.create_future(), loop.create_future()]
+            queue.put_nowait(([{"id": "a"}], futures[0]))
+            queue.put_nowait(([{"id": "b"}, {"id": "c"}], futures[1]))
+            writer = asyncio.create_task(server.video_writer_loop(queue))
+            try:
+                return await asyncio.gather(*futures)
+            finally:
+                writer.cancel()
+
+        server.db.insert_video_batches = fake_insert_video_batches
+        try:
+            results = asyncio.run(run())
+        finally:
+            server.db.insert_video_batches = old_insert
+
+        self.assertEqual([1, 2], results)
+        self.assertEqual([[1, 2]], calls)
+
+
+class RateLimitTest(unittest.TestCase):
+    def setUp(self):
+        server.rate_limit_cache.clear()
+        server.rate_limit_blocked.clear()
+
+    def tearDown(self):
+        server.rate_limit_script = None
+        server.rate_limit_cache.clear()
+        server.rate_limit_blocked.clear()
+
+    def make_request(self):
+        return SimpleNamespace(headers={}, client=SimpleNamespace(host="203.0.113.5"), state=SimpleNamespace())
+
+    def test_shared_counter_rejects_requests_over_limit(self):
+        counts = {}
+
+        async def fake_script(keys, args):
+            counts[keys[0]] = counts.get(keys[0], 0) + 1
+            return counts[keys[0]]
+
+        server.rate_limit_script = fake_script
+        request = self.make_request()
+
+        asyncio.run(server.check_rate_limit(request, limit=2, path_group="search"))
+        asyncio.run(server.check_rate_limit(request, limit=2, path_group="search"))
+        with self.assertRaises(server.HTTPException):
+            asyncio.run(server.check_rate_limit(request, limit=2, path_group="search"))
+        with self.assertRaises(server.HTTPException):
+            asyncio.run(server.check_rate_limit(request, limit=2, path_group="search"))
+
+        self.assertEqual({"ratelimit:203.0.113.5:search": 3}, counts)
+        self.assertEqual(0, len(server.rate_limit_cache))
+
+    def test_local_counter_is_used_when_shared_counter_fails(self):
+        async def broken_script(keys, args):
+            raise ConnectionError("redis down")
+
+        server.rate_limit_script = broken_script
+        request = self.make_request()
+
+        asyncio.run(server.check_rate_limit(request, limit=1, path_group="api"))
+        with self.assertRaises(server.HTTPException):
+            asyncio.run(server.check_rate_limit(request, limit=1, path_group="api"))
+
+    def test_client_ip_is_memoized_on_request_state(self):
+        request = self.make_request()
+
+        self.assertEqual("203.0.113.5", server.get_client_ip(request))
+        request.client = None
+        self.assertEqual("203.0.113.5", server.get_client_ip(request))
+
+    def test_rate_limit_groups_are_resolved_from_path(self):
+        self.assertEqual((20, "sync"), server.get_rate_limit("/api/sync/cancel"))
+        self.assertEqual((90, "search"), server.get_rate_limit("/api/song-details"))
+        self.assertEqual((180, "proxy"), server.get_rate_limit("/api/v2/videos"))
+        self.assertEqual((120, "api"), server.get_rate_limit("/api/stats"))
+
+    def test_static_cache_control_is_looked_up_by_extension(self):
+        self.assertEqual(server.HTML_CACHE_CONTROL, server.get_static_cache_control("/"))
+        self.assertEqual(server.NO_STORE_CACHE_CONTROL, server.get_static_cache_control("/js/app.js"))
+        self.assertEqual(server.IMAGE_CACHE_CONTROL, server.get_static_cache_control("/images/logo.webp"))
+        self.assertIsNone(server.get_static_cache_control("/channels"))
+
+
+class LogListenerTest(unittest.TestCase):
+    def test_unknown_log_level_falls_back_to_warning(self):
+        self.assertEqual(server.logging.DEBUG, server.resolve_log_level("DEBUG"))
+        self.assertEqual(server.logging.WARNING, server.resolve_log_level("VERBOSE"))
+
+    def test_stop_detaches_queue_handler_from_root_logger(self):
+        root = server.logging.getLogger()
+        old_handlers = root.handlers[:]
+        root.handlers = []
+        try:
+            server.start_log_listener()
+            handler = server.log_queue_handler
+            self.assertIn(handler, root.handlers)
+            server.stop_log_listener()
+            self.assertNotIn(handler, root.handlers)
+        finally:
+            server.stop_log_listener()
+            root.handlers = old_handlers
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,207 @@
+import os
+import tempfile
+import unittest
+
+import database
+
+
+def video(video_id, title, channel_id="selected-channel", available_at="2024-01-01T00:00:00Z", **extra):
+    return {
+        "id": video_id,
+        "title": title,
+        "channel": {"id": channel_id, "name": channel_id},
+        "available_at": available_at,
+        "published_at": available_at,
+        "duration": 120,
+        "status": "past",
+        "type": "stream",
+        "topic_id": "talk",
+        "mentions": [],
+        **extra,
+    }
+
+
+class VideoSearchTest(unittest.TestCase):
+    def setUp(self):
+        self.old_db_path = database.DB_PATH
+        handle = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+        handle.close()
+        self.temp_db_path = handle.name
+        database.DB_PATH = self.temp_db_path
+        database.init_db()
+
+    def tearDown(self):
+        database.close_thread_connection()
+        database.DB_PATH = self.old_db_path
+        os.remove(self.temp_db_path)
+
+    def search_ids(self, query, **kwargs):
+        results = database.search_videos(query, "selected-channel", **kwargs)
+        return {item["id"] for item in results}
+
+    def test_title_search_matches_substrings_through_fts_index(self):
+        database.insert_video(video("mine", "【Minecraft】ホロライブ建築"))
+        database.insert_video(video("talk", "雑談 / Free Talk"))
+
+        self.assertTrue(database.title_fts_enabled)
+        self.assertEqual({"mine"}, self.search_ids("minecraft"))
+        self.assertEqual({"mine"}, self.search_ids("ライブ建"))
+        self.assertEqual(1, database.count_videos("free talk", "selected-channel"))
+
+    def test_json_data_keeps_non_ascii_text_unescaped(self):
+        database.insert_video(video("jp", "ホロライブ", mentions=[{"id": "UC-miko", "name": "さくらみこ"}]))
+
+        with database.get_connection() as conn:
+            stored = conn.execute("SELECT json_data FROM videos WHERE id = 'jp'").fetchone()["json_data"]
+        self.assertIn("さくらみこ", stored)
+        self.assertEqual("ホロライブ", database.search_videos(None, "selected-channel")[0]["title"])
+
+    def test_short_title_query_falls_back_to_like(self):
+        database.insert_video(video("talk", "雑談 / Free Talk"))
+        database.insert_video(video("game", "Game"))
+
+        self.assertEqual({"talk"}, self.search_ids("雑談"))
+
+    def test_title_update_refreshes_search_index(self):
+        database.insert_videos_transaction([video("renamed", "Old stream title")])
+        database.insert_videos_transaction([video("renamed", "New karaoke title")])
+
+        self.assertEqual(set(), self.search_ids("old stream"))
+        self.assertEqual({"renamed"}, self.search_ids("karaoke"))
+
+    def test_retitle_and_delete_keep_search_index_in_step(self):
+        database.insert_videos_transaction([video("kept", "Minecraft build"), video("gone", "Minecraft raid")])
+        database.insert_videos_transaction([video("kept", "Karaoke relay")])
+        with database.get_connection() as conn:
+            conn.execute("DELETE FROM videos WHERE id = 'gone'")
+            conn.commit()
+            mapped = conn.execute("SELECT COUNT(*) AS count FROM videos_fts_map").fetchone()["count"]
+
+        self.assertEqual(set(), self.search_ids("minecraft"))
+        self.assertEqual({"kept"}, self.search_ids("karaoke"))
+        self.assertEqual(1, mapped)
+
+    def test_video_without_id_is_stored_outside_search_index(self):
+        database.insert_video(video(None, "Untitled stream"))
+
+        with database.get_connection() as conn:
+            stored = conn.execute("SELECT COUNT(*) AS count FROM videos WHERE id IS NULL").fetchone()["count"]
+            indexed = conn.execute("SELECT COUNT(*) AS count FROM videos_fts").fetchone()["count"]
+        self.assertEqual(1, stored)
+        self.assertEqual(0, indexed)
+
+    def test_single_insert_skips_existing_video(self):
+        self.assertTrue(database.insert_video(video("once", "First title")))
+        self.assertFalse(database.insert_video(video("once", "Second title")))
+
+        self.assertEqual({"once"}, self.search_ids("first title"))
+
+    def test_bulk_insert_counts_only_new_ids_and_refreshes_existing_rows(self):
+        database.insert_videos_transaction([video("kept", "Stream")])
+
+        new_count = database.insert_videos_transaction([
+            video("kept", "Stream", status="missing"),
+            video("added", "Another stream"),
+            video("added", "Another stream"),
+        ])
+
+        self.assertEqual(1, new_count)
+        self.assertNotIn("kept", self.search_ids(None, hide_unarchived=True))
+        self.assertEqual(2, database.count_videos(None, "selected-channel"))
+
+    def test_hide_unarchived_skips_only_explicit_null_topic(self):
+        database.insert_video(video("null-topic", "Placeholder", topic_id=None))
+        database.insert_video(video("no-topic", "No topic key"))
+        database.insert_video(video("nested", "Nested null", songs=[{"name": "song", "topic_id": None}]))
+        with database.get_connection() as conn:
+            conn.execute("UPDATE videos SET topic_id = NULL, json_data = json_remove(json_data, '$.topic_id') WHERE id = 'no-topic'")
+            conn.commit()
+
+        self.assertEqual({"no-topic", "nested"}, self.search_ids(None, hide_unarchived=True))
+
+    def test_video_batches_commit_together_and_count_each_page(self):
+        database.insert_videos_transaction([video("old", "Old")])
+
+        counts = database.insert_video_batches([
+            [video("old", "Old"), video("a", "A")],
+            [video("a", "A"), video("b", "B", channel_id="other-channel")],
+            [],
+        ])
+
+        self.assertEqual([1, 1, 0], counts)
+        self.assertEqual(2, database.count_videos(None, "selected-channel"))
+        self.assertEqual(1, database.count_videos(None, "other-channel"))
+
+    def test_bulk_insert_retries_when_database_is_locked(self):
+        calls = []
+        old_write = database.write_videos_transaction
+        old_sleep = database.time.sleep
+
+        def flaky_write(videos):
+            calls.append(len(videos))
+            if len(calls) == 1:
+                raise database.sqlite3.OperationalError("database is locked")
+            return old_write(videos)
+
+        database.write_videos_transaction = flaky_write
+        database.time.sleep = lambda seconds: None
+        try:
+            new_count = database.insert_videos_transaction([video("retry", "Retried stream")])
+        finally:
+            database.write_videos_transaction = old_write
+            database.time.sleep = old_sleep
+
+        self.assertEqual(1, new_count)
+        self.assertEqual([1, 1], calls)
+
+    def test_connection_is_reused_per_thread_and_left_without_open_transaction(self):
+        with database.get_connection() as first:
+            first.execute("BEGIN")
+            first.execute("DELETE FROM videos")
+        with database.get_connection() as second:
+            self.assertIs(first, second)
+            self.assertFalse(second.in_transaction)
+
+    def test_year_month_filters_coalesce_contiguous_ranges(self):
+        self.assertEqual(
+            [("2023-01", "2023-03"), ("2023-12", "2024-03"), ("2024-12", "2025-01")],
+            database.build_year_month_ranges([2024, 2023], [2, 12, 1]),
+        )
+        self.assertEqual([("2023", "2025")], database.build_year_month_ranges([2024, 2023]))
+
+    def test_year_month_filters_select_matching_videos(self):
+        database.insert_video(video("jan", "January", available_at="2024-01-31T23:00:00Z"))
+        database.insert_video(video("feb", "February", available_at="2024-02-01T00:00:00Z"))
+        database.insert_video(video("dec", "December", available_at="2023-12-15T00:00:00Z"))
+
+        self.assertEqual({"jan", "dec"}, self.search_ids(None, filter_years=[2023, 2024], filter_months=[1, 12]))
+        self.assertEqual({"dec"}, self.search_ids(None, filter_years=[2023]))
+        self.assertEqual(2, database.count_videos(None, "selected-channel", filter_years=[2024]))
+
+    def test_search_sql_is_shared_across_padded_filter_lists(self):
+        database.insert_video(video("a", "A", available_at="2024-01-01T00:00:00Z"))
+        database.insert_video(video("b", "B", available_at="2024-01-02T00:00:00Z"))
+        database.insert_video(video("c", "C", available_at="2024-01-03T00:00:00Z"))
+
+        three_sql, three_params = database.build_video_search_where(None, "selected-channel", filter_dates=["2024-01-01", "2024-01-02", "2024-01-03"])
+        four_sql, _ = database.build_video_search_where(None, "selected-channel", filter_dates=["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"])
+
+        self.assertIs(three_sql, four_sql)
+        self.assertEqual(["selected-channel", "2024-01-01%", "2024-01-02%", "2024-01-03%", "2024-01-03%"], three_params)
+        self.assertEqual({"a", "b", "c"}, self.search_ids(None, filter_dates=["2024-01-01", "2024-01-02", "2024-01-03"]))
+
+    def test_search_with_total_returns_page_and_full_count(self):
+        for day in range(1, 6):
+            database.insert_video(video(f"v{day}", f"Stream {day}", available_at=f"2024-01-0{day}T00:00:00Z"))
+
+        items, total = database.search_videos_with_total(None, "selected-channel", limit=2, offset=2)
+        self.assertEqual(["v3", "v2"], [item["id"] for item in items])
+        self.assertEqual(5, total)
+
+        items, total = database.search_videos_with_total(None, "selected-channel", limit=2, offset=10)
+        self.assertEqual(([], 5), (items, total))
+        self.assertEqual(([], 0), database.search_videos_with_total("missing title", "selected-channel"))
+
+
+if __name__ == "__main__":
+    unittest.main()
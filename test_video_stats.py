@@ -0,0 +1,213 @@
+import os
+import tempfile
+import unittest
+
+import database
+
+
+def video(video_id, available_at="2024-01-01T00:00:00Z", channel_id="selected-channel", mentions=None, **extra):
+    return {
+        "id": video_id,
+        "title": video_id,
+        "channel": {"id": channel_id, "name": channel_id},
+        "available_at": available_at,
+        "published_at": available_at,
+        "duration": 120,
+        "status": "past",
+        "type": "stream",
+        "topic_id": "talk",
+        "mentions": mentions or [],
+        **extra,
+    }
+
+
+class VideoStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.old_db_path = database.DB_PATH
+        handle = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+        handle.close()
+        self.temp_db_path = handle.name
+        database.DB_PATH = self.temp_db_path
+        database.init_db()
+
+    def tearDown(self):
+        database.close_thread_connection()
+        database.DB_PATH = self.old_db_path
+        os.remove(self.temp_db_path)
+
+    def test_collab_stats_count_mentions_on_own_videos(self):
+        pekora = {"id": "pekora", "name": "Pekora", "photo": ""}
+        pekora_with_photo = {"id": "pekora", "name": "Pekora", "photo": "https://example.com/pekora.png"}
+        miko = {"id": "miko", "english_name": "Miko"}
+        database.insert_videos_transaction([
+            video("a", "2023-05-01T00:00:00Z", mentions=[pekora, miko]),
+            video("b", "2024-05-01T00:00:00Z", mentions=[pekora_with_photo]),
+            video("c", "2024-06-01T00:00:00Z", channel_id="other-channel", mentions=[miko]),
+        ])
+
+        self.assertEqual(
+            [
+                {"id": "pekora", "name": "Pekora", "photo": "https://example.com/pekora.png", "count": 2},
+                {"id": "miko", "name": "Miko", "photo": "", "count": 1},
+            ],
+            database.get_collab_stats("selected-channel"),
+        )
+        self.assertEqual(
+            [{"id": "pekora", "name": "Pekora", "photo": "https://example.com/pekora.png", "count": 1}],
+            database.get_yearly_collab_stats("selected-channel", "2024"),
+        )
+
+    def test_yearly_topic_stats_use_year_bounds(self):
+        database.insert_videos_transaction([
+            video("a", "2023-12-31T23:59:59Z", topic_id="minecraft"),
+            video("b", "2024-01-01T00:00:00Z", topic_id="minecraft"),
+            video("c", "2024-07-01T00:00:00Z", topic_id="membersonly"),
+        ])
+
+        self.assertEqual([{"topic": "minecraft", "count": 1}], database.get_yearly_topic_stats("selected-channel", "2024"))
+
+    def test_topic_exclusions_are_editable_data(self):
+        database.insert_videos_transaction([
+            video("a", topic_id="minecraft"),
+            video("b", topic_id="shorts"),
+        ])
+        self.assertEqual([{"topic": "minecraft", "count": 1}], database.get_topic_stats("selected-channel"))
+
+        with database.get_connection() as conn:
+            conn.execute("DELETE FROM excluded_topics WHERE topic_id = 'shorts'")
+            conn.commit()
+        database.init_db()
+
+        self.assertEqual({"minecraft", "shorts"}, {item["topic"] for item in database.get_topic_stats("selected-channel")})
+
+    def test_month_stats_follow_inserts_updates_and_deletes(self):
+        database.insert_videos_transaction([
+            video("a", "2023-12-01T00:00:00Z"),
+            video("b", "2024-01-05T00:00:00Z", title="【メン限】雑談"),
+            video("c", "2024-01-20T00:00:00Z", topic_id="membersonly"),
+            video("d", "2024-03-01T00:00:00Z", channel_id="other-channel"),
+        ])
+        database.insert_videos_transaction([video("a", "2024-03-01T00:00:00Z")])
+        with database.get_connection() as conn:
+            conn.execute("DELETE FROM videos WHERE id = 'c'")
+            conn.commit()
+
+        self.assertEqual([{"year": "2024", "count": 2}], database.get_yearly_stats("selected-channel"))
+        self.assertEqual([{"year": "2024", "count": 1}], database.get_yearly_membership_stats("selected-channel"))
+        monthly = database.get_monthly_stats("selected-channel", "2024")
+        self.assertEqual(12, len(monthly))
+        self.assertEqual([1, 0, 1], [item["count"] for item in monthly[:3]])
+        self.assertEqual(1, database.get_monthly_membership_stats("selected-channel", "2024")[0]["count"])
+
+    def test_membership_column_is_backfilled_for_old_databases(self):
+        database.close_thread_connection()
+        os.remove(self.temp_db_path)
+        with database.get_connection() as conn:
+            conn.execute("""
+                CREATE TABLE videos (
+                    id TEXT PRIMARY KEY, title TEXT, channel_id TEXT, channel_name TEXT,
+                    published_at TEXT, available_at TEXT, duration INTEGER, status TEXT,
+                    type TEXT, topic_id TEXT, json_data TEXT
+                )
+            """)
+            conn.execute(
+                "INSERT INTO videos (id, title, channel_id, available_at, json_data) VALUES (?, ?, ?, ?, ?)",
+                ("old", "members only talk", "selected-channel", "2022-02-02T00:00:00Z", "{}"),
+            )
+            conn.commit()
+
+        database.init_db()
+
+        self.assertEqual([{"year": "2022", "count": 1}], database.get_yearly_membership_stats("selected-channel"))
+        database.insert_video(video("new", "2022-03-01T00:00:00Z", topic_id="membersonly"))
+        self.assertEqual([{"year": "2022", "count": 2}], database.get_yearly_membership_stats("selected-channel"))
+
+    def test_mention_backfill_streams_existing_videos(self):
+        database.insert_videos_transaction([
+            video(f"v{index}", mentions=[{"id": "pekora", "name": "Pekora"}]) for index in range(3)
+        ])
+        with database.get_connection() as conn:
+            conn.execute("DELETE FROM video_mentions")
+            conn.commit()
+
+        database.init_db()
+
+        self.assertEqual(3, database.get_collab_stats("selected-channel")[0]["count"])
+
+    def test_rowid_mentions_table_is_migrated_without_rowid(self):
+        database.insert_videos_transaction([video("a", mentions=[{"id": "pekora", "name": "Pekora"}])])
+        with database.get_connection() as conn:
+            conn.execute("DROP TABLE video_mentions")
+            conn.execute("""
+                CREATE TABLE video_mentions (
+                    video_id TEXT NOT NULL, mention_id TEXT NOT NULL, mention_name TEXT,
+                    mention_english_name TEXT, mention_photo TEXT, raw_json TEXT,
+                    PRIMARY KEY(video_id, mention_id)
+                )
+            """)
+            conn.execute("INSERT INTO video_mentions (video_id, mention_id, mention_name) VALUES ('a', 'pekora', 'Pekora')")
+            conn.commit()
+
+        database.init_db()
+
+        with database.get_connection() as conn:
+            table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'video_mentions'").fetchone()["sql"]
+        self.assertIn("WITHOUT ROWID", table_sql)
+        self.assertEqual(1, database.get_collab_stats("selected-channel")[0]["count"])
+
+    def test_channel_index_merges_hosts_and_mentions(self):
+        host = "UChost0000000000000000"
+        guest = "UCguest000000000000000"
+        database.insert_videos_transaction([
+            video("a", channel_id=host, mentions=[{"id": guest, "name": "Guest", "org": "Indie"}]),
+            video("b", channel_id=host, mentions=[{"id": host, "name": "Host"}]),
+        ])
+
+        items = {item["id"]: item for item in database.build_channel_index()}
+
+        self.assertEqual(3, items[host]["count"])
+        self.assertEqual(host, items[host]["name"])
+        self.assertEqual({"name": "Guest", "org": "Indie", "count": 1},
+                         {key: items[guest][key] for key in ("name", "org", "count")})
+
+    def test_channel_index_uses_latest_names_and_json_channel_id_fallback(self):
+        host = "UChost0000000000000000"
+        guest = "UCguest000000000000000"
+        orphan = "UCorphan00000000000000"
+        database.insert_videos_transaction([
+            video("old", available_at="2023-01-01T00:00:00Z", channel_id=host,
+                  mentions=[{"id": guest, "name": "Zeta Guest"}], channel={"id": host, "name": "Zeta Host"}),
+            video("new", available_at="2024-01-01T00:00:00Z", channel_id=host,
+                  mentions=[{"id": guest, "name": "Alpha Guest"}], channel={"id": host, "name": "Alpha Host"}),
+        ])
+        with database.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO videos (id, channel_id, available_at, json_data) VALUES ('lost', NULL, ?, json_object('channel', json_object('id', ?, 'name', 'Orphan')))",
+                ("2024-01-01T00:00:00Z", orphan),
+            )
+            conn.commit()
+
+        items = {item["id"]: item for item in database.build_channel_index()}
+
+        self.assertEqual("Alpha Host", items[host]["name"])
+        self.assertEqual("Alpha Guest", items[guest]["name"])
+        self.assertEqual("Orphan", items[orphan]["name"])
+
+    def test_song_search_finds_songs_where_channel_is_mentioned(self):
+        host = "UChost0000000000000000"
+        guest = "UCguest000000000000000"
+        songs = [{"name": "Song", "start": 10, "end": 200}]
+        database.insert_videos_transaction([
+            video("duet", channel_id=host, mentions=[{"id": guest, "name": "Guest"}], songs=songs),
+            video("solo", channel_id=host, songs=songs),
+        ])
+
+        guest_songs = database.get_songs_response(None, guest)
+        collab_songs = database.get_songs_response(None, host, collab_member=guest)
+
+        self.assertEqual(["duet"], [item["video_id"] for item in guest_songs["items"]])
+        self.assertEqual(["duet"], [item["video_id"] for item in collab_songs["items"]])
+
+
+if __name__ == "__main__":
+    unittest.main()